@@ -28,478 +28,159 @@ st.set_page_config(
 # =============================================================================
 # IMPORTS
 # =============================================================================
-import numpy as np
-from PIL import Image
-import io
-
-# =============================================================================
-# CSS - HIDE STREAMLIT UI BUT KEEP SIDEBAR TOGGLE VISIBLE
-# =============================================================================
-st.markdown("""
-<style>
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    .stDeployButton {display: none !important;}
-    [data-testid="stToolbar"] > div:first-child {display: none !important;}
-    .stActionButton {display: none !important;}
-    [data-testid="stSidebarNav"] {display: none;}
-    .stStatusWidget, [data-testid="manage-app-button"] {display: none !important;}
-    .viewerBadge_container__r5tak {display: none !important;}
-    
-    /* KEEP SIDEBAR TOGGLE ARROW VISIBLE */
-    [data-testid="stSidebarCollapsedControl"],
-    [data-testid="collapsedControl"] {
-        display: flex !important;
-        visibility: visible !important;
-    }
-    
-    [data-testid="stSidebarCollapsedControl"] button,
-    [data-testid="collapsedControl"] button,
-    button[kind="header"] {
-        background: rgba(0, 212, 255, 0.15) !important;
-        border: 1px solid rgba(0, 212, 255, 0.4) !important;
-        border-radius: 8px !important;
-    }
-    
-    [data-testid="stSidebarCollapsedControl"] svg,
-    [data-testid="collapsedControl"] svg {
-        color: #00d4ff !important;
-        stroke: #00d4ff !important;
-    }
-    
-    header[data-testid="stHeader"] {
-        background: transparent !important;
-    }
-    
-    /* Import Premium Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&display=swap');
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
-    
-    /* Dark Theme */
-    :root {
-        --bg-dark: #0E1117;
-        --neon-cyan: #00d4ff;
-        --neon-pink: #ff007f;
-        --text-primary: #FAFAFA;
-        --text-secondary: #94a3b8;
-    }
-    
-    html, body, .stApp {
-        background: var(--bg-dark) !important;
-    }
-    
-    .stApp {
-        background-image: 
-            radial-gradient(ellipse 80% 50% at 20% -20%, rgba(0, 212, 255, 0.12) 0%, transparent 50%),
-            radial-gradient(ellipse 60% 40% at 80% 100%, rgba(255, 0, 127, 0.08) 0%, transparent 50%);
-    }
-    
-    /* Glassmorphism Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(14, 17, 23, 0.95) 0%, rgba(22, 27, 34, 0.98) 100%) !important;
-        backdrop-filter: blur(20px);
-        border-right: 1px solid rgba(0, 212, 255, 0.2);
-    }
-    
-    /* Neon Header */
-    .neon-header {
-        text-align: center;
-        padding: 2rem;
-        margin-bottom: 2rem;
-        background: linear-gradient(180deg, rgba(0, 212, 255, 0.08) 0%, transparent 100%);
-        border-radius: 20px;
-        border: 1px solid rgba(0, 212, 255, 0.2);
-    }
-    
-    .neon-title {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 2.5rem;
-        font-weight: 900;
-        background: linear-gradient(135deg, #00d4ff 0%, #ff007f 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-    }
-    
-    .neon-subtitle {
-        color: var(--text-secondary);
-        font-size: 1rem;
-        letter-spacing: 0.2em;
-        text-transform: uppercase;
-        margin-top: 0.5rem;
-    }
-    
-    /* Image Cards */
-    .image-card {
-        background: rgba(22, 27, 34, 0.8);
-        backdrop-filter: blur(15px);
-        border-radius: 16px;
-        padding: 1.25rem;
-        margin-bottom: 1rem;
-        border: 1px solid rgba(0, 212, 255, 0.2);
-        transition: all 0.3s ease;
-    }
-    
-    .image-card:hover {
-        transform: translateY(-4px);
-        border-color: rgba(0, 212, 255, 0.5);
-        box-shadow: 0 8px 30px rgba(0, 212, 255, 0.15);
-    }
-    
-    .card-label {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 0.8rem;
-        font-weight: 600;
-        letter-spacing: 0.1em;
-        text-transform: uppercase;
-        text-align: center;
-        margin-bottom: 1rem;
-        padding: 0.5rem;
-        border-radius: 8px;
-    }
-    
-    .label-original {
-        color: #00d4ff;
-        background: rgba(0, 212, 255, 0.1);
-        border: 1px solid rgba(0, 212, 255, 0.3);
-    }
-    
-    .label-processed {
-        color: #ff007f;
-        background: rgba(255, 0, 127, 0.1);
-        border: 1px solid rgba(255, 0, 127, 0.3);
-    }
-    
-    [data-testid="stImage"] img {
-        border-radius: 12px !important;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.4);
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #00d4ff 0%, #ff007f 100%) !important;
-        border: none !important;
-        color: white !important;
-        font-weight: 600 !important;
-        border-radius: 10px !important;
-        padding: 0.6rem 1.2rem !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(0, 212, 255, 0.4) !important;
-    }
-    
-    .stDownloadButton > button {
-        background: linear-gradient(135deg, #00ff88 0%, #00cc6a 100%) !important;
-        color: #0a0d12 !important;
-        font-weight: 700 !important;
-        border: none !important;
-        border-radius: 10px !important;
-    }
-    
-    /* Sticky Footer */
-    .sticky-footer {
-        position: fixed;
-        bottom: 0;
-        left: 0;
-        right: 0;
-        z-index: 999;
-        text-align: center;
-        padding: 1rem 1rem;
-        background: linear-gradient(180deg, rgba(14, 17, 23, 0.95) 0%, rgba(14, 17, 23, 0.98) 100%);
-        backdrop-filter: blur(15px);
-        border-top: 1px solid rgba(0, 212, 255, 0.3);
-        box-shadow: 0 -4px 20px rgba(0, 0, 0, 0.3);
-    }
-    
-    .footer-title {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 0.75rem;
-        font-weight: 600;
-        color: #00d4ff;
-        letter-spacing: 0.1em;
-        text-transform: uppercase;
-        margin-bottom: 0.6rem;
-    }
-    
-    .contributors-list {
-        display: flex;
-        flex-wrap: wrap;
-        justify-content: center;
-        gap: 0.5rem;
-        max-width: 900px;
-        margin: 0 auto;
-    }
-    
-    .contributor-link {
-        font-size: 0.8rem;
-        color: var(--text-secondary);
-        padding: 0.3rem 0.8rem;
-        background: rgba(0, 212, 255, 0.06);
-        border: 1px solid rgba(0, 212, 255, 0.15);
-        border-radius: 20px;
-        text-decoration: none;
-        transition: all 0.3s ease;
-        display: inline-flex;
-        align-items: center;
-        gap: 0.4rem;
-    }
-    
-    .contributor-link:hover {
-        background: rgba(0, 212, 255, 0.15);
-        color: #00d4ff;
-        text-decoration: underline;
-        transform: translateY(-2px);
-        border-color: rgba(0, 212, 255, 0.4);
-        box-shadow: 0 4px 15px rgba(0, 212, 255, 0.2);
-    }
-    
-    .contributor-link i {
-        font-size: 0.85rem;
-    }
-    
-    .footer-brand {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 0.65rem;
-        background: linear-gradient(135deg, #00d4ff 0%, #ff007f 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-top: 0.6rem;
-    }
-    
-    /* Add padding to prevent content from being hidden behind the footer */
-    .stApp > div:first-child {
-        padding-bottom: 120px;
-    }
-    
-    /* Welcome Card */
-    .welcome-card {
-        background: rgba(22, 27, 34, 0.8);
-        backdrop-filter: blur(20px);
-        border: 1px solid rgba(0, 212, 255, 0.2);
-        border-radius: 20px;
-        padding: 3rem 2rem;
-        text-align: center;
-        max-width: 600px;
-        margin: 2rem auto;
-    }
-    
-    .welcome-icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    
-    .welcome-title {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 1.8rem;
-        background: linear-gradient(135deg, #00d4ff 0%, #ff007f 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 1rem;
-    }
-    
-    .welcome-text {
-        color: var(--text-secondary);
-        font-size: 1.05rem;
-        line-height: 1.8;
-    }
-</style>
-""", unsafe_allow_html=True)
+import os
+import uuid
+from concurrent.futures import wait
+from functools import partial
 
+# Only NumPy-free modules here; the filter stack (NumPy, Pillow) loads with
+# the first upload, so the welcome page starts without it.
+from dip_studio.cache import ResultCache, content_digest
+from dip_studio.jobs import JOB_WAIT_SECONDS, SessionJobs
+from dip_studio.profiling import ENCODE_TIMINGS, PROFILE, profile_request, profile_stage, traces_jsonl
 
 # =============================================================================
-# NUMPY-BASED IMAGE PROCESSING FILTERS (From Scratch)
+# CSS - HIDE STREAMLIT UI BUT KEEP SIDEBAR TOGGLE VISIBLE
 # =============================================================================
+# Kept in static/dip_studio.css and read from disk once per server process,
+# but inlined, so every rerun still sends the whole sheet (~7 KB) to the
+# browser, as before it moved out of app.py; benchmarks/startup.py reports
+# the size. A <link> to /app/static would be fetched once, but needs a
+# Streamlit that serves it as text/css; releases allowed by requirements.txt
+# may send text/plain with nosniff, and browsers then drop the sheet.
+@st.cache_resource
+def get_stylesheet():
+    """The app stylesheet as a <style> block."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "dip_studio.css")) as f:
+        return f"<style>\n{f.read()}</style>"
 
-def numpy_convolve2d(image, kernel):
-    """Manual 2D convolution using pure NumPy."""
-    if len(image.shape) == 3:
-        # Process each channel separately for color images
-        result = np.zeros_like(image, dtype=np.float64)
-        for c in range(image.shape[2]):
-            result[:, :, c] = numpy_convolve2d(image[:, :, c], kernel)
-        return np.clip(result, 0, 255).astype(np.uint8)
-    
-    image = image.astype(np.float64)
-    kh, kw = kernel.shape
-    pad_h, pad_w = kh // 2, kw // 2
-    
-    # Pad image
-    padded = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='reflect')
-    
-    # Output array
-    output = np.zeros_like(image, dtype=np.float64)
-    
-    # Perform convolution
-    for i in range(kh):
-        for j in range(kw):
-            output += kernel[i, j] * padded[i:i+image.shape[0], j:j+image.shape[1]]
-    
-    return np.clip(output, 0, 255).astype(np.uint8)
-
-
-def numpy_grayscale(image):
-    """Convert to grayscale using luminosity formula."""
-    if len(image.shape) == 2:
-        return image
-    # Y = 0.299*R + 0.587*G + 0.114*B
-    return np.dot(image[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
 
-
-def numpy_gaussian_blur(image, kernel_size=5, sigma=1.0):
-    """Gaussian blur using manually created kernel."""
-    if kernel_size % 2 == 0:
-        kernel_size += 1
-    
-    # Create Gaussian kernel
-    ax = np.linspace(-(kernel_size // 2), kernel_size // 2, kernel_size)
-    xx, yy = np.meshgrid(ax, ax)
-    kernel = np.exp(-(xx**2 + yy**2) / (2 * sigma**2))
-    kernel = kernel / kernel.sum()
-    
-    return numpy_convolve2d(image, kernel)
+st.markdown(get_stylesheet(), unsafe_allow_html=True)
 
 
-def numpy_box_blur(image, kernel_size=5):
-    """Box blur (average filter) using NumPy."""
-    if kernel_size % 2 == 0:
-        kernel_size += 1
-    kernel = np.ones((kernel_size, kernel_size), dtype=np.float64) / (kernel_size * kernel_size)
-    return numpy_convolve2d(image, kernel)
-
-
-def numpy_sharpen(image, strength=1.0):
-    """Sharpening filter using NumPy."""
-    kernel = np.array([
-        [0, -1, 0],
-        [-1, 5, -1],
-        [0, -1, 0]
-    ], dtype=np.float64)
-    
-    if strength != 1.0:
-        identity = np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]], dtype=np.float64)
-        kernel = identity + strength * (kernel - identity)
-    
-    return numpy_convolve2d(image, kernel)
-
-
-def numpy_sobel_edge(image):
-    """Sobel edge detection using NumPy."""
-    gray = numpy_grayscale(image)
-    
-    sobel_x = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float64)
-    sobel_y = np.array([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=np.float64)
-    
-    gray = gray.astype(np.float64)
-    pad_gray = np.pad(gray, ((1, 1), (1, 1)), mode='reflect')
-    
-    gx = np.zeros_like(gray)
-    gy = np.zeros_like(gray)
-    
-    for i in range(3):
-        for j in range(3):
-            gx += sobel_x[i, j] * pad_gray[i:i+gray.shape[0], j:j+gray.shape[1]]
-            gy += sobel_y[i, j] * pad_gray[i:i+gray.shape[0], j:j+gray.shape[1]]
-    
-    magnitude = np.sqrt(gx**2 + gy**2)
-    magnitude = (magnitude / magnitude.max() * 255).astype(np.uint8) if magnitude.max() > 0 else magnitude.astype(np.uint8)
-    return magnitude
-
-
-def numpy_laplacian(image):
-    """Laplacian edge detection using NumPy."""
-    gray = numpy_grayscale(image)
-    kernel = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=np.float64)
-    
-    gray = gray.astype(np.float64)
-    pad_gray = np.pad(gray, ((1, 1), (1, 1)), mode='reflect')
-    
-    output = np.zeros_like(gray)
-    for i in range(3):
-        for j in range(3):
-            output += kernel[i, j] * pad_gray[i:i+gray.shape[0], j:j+gray.shape[1]]
-    
-    output = np.abs(output)
-    output = (output / output.max() * 255).astype(np.uint8) if output.max() > 0 else output.astype(np.uint8)
-    return output
-
-
-def numpy_threshold(image, threshold_value=128):
-    """Binary thresholding using NumPy."""
-    gray = numpy_grayscale(image)
-    return ((gray > threshold_value) * 255).astype(np.uint8)
-
-
-def numpy_invert(image):
-    """Invert colors using NumPy."""
-    return (255 - image).astype(np.uint8)
-
-
-def numpy_brightness(image, value=0):
-    """Adjust brightness using NumPy."""
-    return np.clip(image.astype(np.int16) + value, 0, 255).astype(np.uint8)
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+# Filters, pipelines and encoders live in the dip_studio package, which has
+# no Streamlit dependency; the app only decides where the cache lives.
+@st.cache_resource
+def get_result_cache():
+    """One cache per server process, shared by every session and rerun."""
+    return ResultCache()
 
 
-def numpy_contrast(image, factor=1.0):
-    """Adjust contrast using NumPy."""
-    mean = 128
-    return np.clip((image.astype(np.float64) - mean) * factor + mean, 0, 255).astype(np.uint8)
+@st.cache_resource
+def get_session_jobs():
+    """Background filter jobs, at most one live per session."""
+    return SessionJobs()
 
 
-def numpy_median_filter(image, kernel_size=3):
-    """Median filter for noise removal using NumPy."""
-    if kernel_size % 2 == 0:
-        kernel_size += 1
-    
-    pad = kernel_size // 2
-    
-    if len(image.shape) == 3:
-        result = np.zeros_like(image)
-        for c in range(image.shape[2]):
-            result[:, :, c] = numpy_median_filter(image[:, :, c], kernel_size)
-        return result
-    
-    padded = np.pad(image, pad, mode='reflect')
-    output = np.zeros_like(image)
-    
-    for i in range(image.shape[0]):
-        for j in range(image.shape[1]):
-            window = padded[i:i+kernel_size, j:j+kernel_size]
-            output[i, j] = np.median(window)
+def filter_job(cache, digest, image, steps, scale):
+    """Job body: the recipe on the job thread, profiled as its own 'filter' request."""
+    from dip_studio.pipeline import cached_pipeline
     
-    return output.astype(np.uint8)
+    step_names = " → ".join(name for name, _ in steps)
+    with profile_request("filter", steps=step_names, scale=scale):
+        with profile_stage("filter", steps=step_names, scale=scale):
+            return cached_pipeline(cache, digest, image, steps, scale)
 
 
-def numpy_emboss(image):
-    """Emboss effect using NumPy."""
-    kernel = np.array([[-2, -1, 0], [-1, 1, 1], [0, 1, 2]], dtype=np.float64)
-    result = numpy_convolve2d(image, kernel)
-    return np.clip(result + 128, 0, 255).astype(np.uint8)
-
-
-def numpy_sepia(image):
-    """Sepia tone filter using NumPy."""
-    if len(image.shape) == 2:
-        image = np.stack([image] * 3, axis=-1)
-    
-    sepia_matrix = np.array([
-        [0.393, 0.769, 0.189],
-        [0.349, 0.686, 0.168],
-        [0.272, 0.534, 0.131]
-    ])
-    
-    result = image.dot(sepia_matrix.T)
-    return np.clip(result, 0, 255).astype(np.uint8)
+@st.fragment(run_every=JOB_WAIT_SECONDS)
+def rerun_when_done(job):
+    """Poll a background job and rerun the page once its result is ready."""
+    if job.done():
+        st.rerun()
 
 
 # =============================================================================
 # MAIN APPLICATION
 # =============================================================================
 
+# UI parameter -> slider (label, min, max, default, step, help)
+PARAM_SLIDERS = {
+    "threshold": ("Threshold Value", 0, 255, 128, None, None),
+    "value": ("Brightness", -100, 100, 0, None, None),
+    "factor": ("Contrast", 0.5, 2.0, 1.0, None, None),
+    "clip": ("Clip %", 0.0, 5.0, 0.5, 0.1, "Share of samples saturated at each end"),
+    "strength": ("Strength", 0.5, 3.0, 1.0, None, None),
+    "kernel_size": ("Kernel Size", 3, 15, 5, 2, None),
+    "sigma": ("Sigma", 0.5, 5.0, 1.0, None, None),
+}
+# Filter -> its sliders, in display order; filters missing here have no parameters
+FILTER_SLIDERS = {
+    "Threshold": ("threshold",),
+    "Brightness": ("value",),
+    "Contrast": ("factor",),
+    "Auto Levels": ("clip",),
+    "Sharpen": ("strength",),
+    "Gaussian Blur": ("kernel_size", "sigma"),
+    "Box Blur": ("kernel_size",),
+    "Median Filter": ("kernel_size",),
+}
+
+
+def param_sliders(filter_name, params=None, step_index=None):
+    """Sliders for a filter's parameters starting at params; returns the chosen values.
+    
+    With step_index, the sliders edit that recipe step in place.
+    """
+    params = params or {}
+    chosen = {}
+    for param in FILTER_SLIDERS.get(filter_name, ()):
+        label, low, high, default, step, help_text = PARAM_SLIDERS[param]
+        editing = {} if step_index is None else {
+            "key": f"step_{step_index}_{param}", "on_change": edit_recipe_step, "args": (step_index, param),
+        }
+        chosen[param] = st.slider(label, low, high, params.get(param, default), step=step, help=help_text, **editing)
+    return chosen
+
+
+def add_recipe_step(filter_name, params):
+    """Append the selected filter to the recipe and reset the selector for the next step."""
+    st.session_state["recipe"].append((filter_name, params))
+    st.session_state["filter_category"] = "🚫 None"
+
+
+def edit_recipe_step(index, param):
+    """Copy an edited step slider into the recipe; later steps resume from the cached prefix."""
+    name, params = st.session_state["recipe"][index]
+    st.session_state["recipe"][index] = (name, {**params, param: st.session_state[f"step_{index}_{param}"]})
+
+
+def remove_recipe_steps(index=None):
+    """Drop one recipe step (default: all); step sliders then start again from the recipe."""
+    recipe = st.session_state["recipe"]
+    if index is None:
+        recipe.clear()
+    else:
+        recipe.pop(index)
+    for key in [key for key in st.session_state if key.startswith("step_")]:
+        del st.session_state[key]
+
+
+def show_profile_panel(trace):
+    """Debug panel with the stages of this rerun and an export of recent requests."""
+    with st.expander("🐞 Profile", expanded=False):
+        if trace["stages"]:
+            st.dataframe(
+                [
+                    {
+                        "stage": entry["stage"],
+                        "ms": round(entry["seconds"] * 1000, 1),
+                        "peak MB": round(entry["peak_bytes"] / 2**20, 1),
+                        "net MB": round(entry["net_bytes"] / 2**20, 1),
+                    }
+                    for entry in trace["stages"]
+                ],
+                hide_index=True, use_container_width=True
+            )
+        st.caption(f"Rerun: {trace['seconds'] * 1000:.0f} ms · {len(trace['stages'])} stages timed")
+        st.download_button(
+            "⬇️ Recent traces (JSON lines)", traces_jsonl, "dip_profile.jsonl", "application/x-ndjson",
+            on_click="ignore"
+        )
+
+
 def main():
     # Header
     st.markdown("""
@@ -520,7 +201,10 @@ def main():
         """, unsafe_allow_html=True)
         
         st.markdown("### 📤 Step 1: Upload Image")
-        uploaded_file = st.file_uploader("Choose an image", type=['jpg', 'jpeg', 'png'], label_visibility="collapsed")
+        uploaded_file = st.file_uploader(
+            "Choose an image", type=['jpg', 'jpeg', 'png', 'gif', 'webp', 'mp4', 'mov', 'avi'],
+            label_visibility="collapsed"
+        )
         
         st.markdown("---")
         st.markdown("### 🎛️ Step 2: Select Filter")
@@ -528,40 +212,67 @@ def main():
         filter_category = st.selectbox(
             "Category",
             ["🚫 None", "🎨 Basic", "✨ Enhancement", "🔍 Edge Detection", "🎭 Effects"],
-            label_visibility="collapsed"
+            label_visibility="collapsed",
+            key="filter_category"
         )
         
         # Filter selection based on category
         selected_filter = "None"
-        filter_params = {}
         
         if filter_category == "🎨 Basic":
-            selected_filter = st.selectbox("Filter", ["Grayscale", "Invert", "Threshold"])
-            if selected_filter == "Threshold":
-                filter_params["threshold"] = st.slider("Threshold Value", 0, 255, 128)
+            selected_filter = st.selectbox("Filter", ["Grayscale", "Invert", "Threshold", "Auto Threshold"])
         
         elif filter_category == "✨ Enhancement":
-            selected_filter = st.selectbox("Filter", ["Brightness", "Contrast", "Sharpen", "Gaussian Blur", "Box Blur", "Median Filter"])
-            if selected_filter == "Brightness":
-                filter_params["value"] = st.slider("Brightness", -100, 100, 0)
-            elif selected_filter == "Contrast":
-                filter_params["factor"] = st.slider("Contrast", 0.5, 2.0, 1.0)
-            elif selected_filter == "Sharpen":
-                filter_params["strength"] = st.slider("Strength", 0.5, 3.0, 1.0)
-            elif selected_filter in ["Gaussian Blur", "Box Blur", "Median Filter"]:
-                filter_params["kernel_size"] = st.slider("Kernel Size", 3, 15, 5, step=2)
-                if selected_filter == "Gaussian Blur":
-                    filter_params["sigma"] = st.slider("Sigma", 0.5, 5.0, 1.0)
+            selected_filter = st.selectbox("Filter", ["Brightness", "Contrast", "Auto Levels", "Sharpen", "Gaussian Blur", "Box Blur", "Median Filter"])
         
         elif filter_category == "🔍 Edge Detection":
-            selected_filter = st.selectbox("Filter", ["Sobel", "Laplacian"])
+            selected_filter = st.selectbox("Filter", ["Sobel", "Laplacian", "Thin Edges"])
         
         elif filter_category == "🎭 Effects":
             selected_filter = st.selectbox("Filter", ["Sepia", "Emboss"])
         
+        filter_params = param_sliders(selected_filter)
+        
+        # Recipe: earlier steps, applied before the filter selected above
+        recipe = st.session_state.setdefault("recipe", [])
+        if selected_filter != "None":
+            st.button(
+                "➕ Add to recipe", on_click=add_recipe_step, args=(selected_filter, dict(filter_params)),
+                use_container_width=True
+            )
+        if recipe:
+            st.markdown("#### 🧪 Recipe")
+            for index, (name, params) in enumerate(recipe):
+                col_step, col_remove = st.columns([5, 1])
+                details = ", ".join(f"{key}={value}" for key, value in params.items())
+                label = f"{index + 1}. {name}" + (f" ({details})" if details else "")
+                if name in FILTER_SLIDERS:
+                    with col_step.expander(label):
+                        param_sliders(name, params, step_index=index)
+                else:
+                    col_step.caption(label)
+                col_remove.button("✖", key=f"remove_step_{index}", on_click=remove_recipe_steps, args=(index,))
+            st.button("🗑️ Clear recipe", on_click=remove_recipe_steps, use_container_width=True)
+        
+        progressive = st.toggle(
+            "⚡ Progressive preview", value=True,
+            help="Filter a downscaled copy while you adjust; full resolution on demand"
+        )
+        
         st.markdown("---")
         st.markdown("### 💾 Step 3: Download")
         st.info("Process an image to enable download")
+        
+        with st.expander("📊 Stats", expanded=False):
+            stats = get_result_cache().stats()
+            st.caption(
+                f"Cache: {stats['entries']} entries · {stats['size_bytes'] / 2**20:.1f} / "
+                f"{stats['budget_bytes'] / 2**20:.0f} MB · {stats['hits']} hits · "
+                f"{stats['misses']} misses ({stats['hit_rate']:.0%})"
+            )
+            # Download threads add formats while this runs, so iterate a snapshot
+            for fmt, (seconds, size) in list(ENCODE_TIMINGS.items()):
+                st.caption(f"Last {fmt} encode: {seconds * 1000:.0f} ms · {size / 2**20:.2f} MB")
     
     # Main content area
     if uploaded_file is None:
@@ -577,50 +288,74 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     else:
+        import numpy as np
+        
+        from dip_studio.frames import CLIP_FORMATS, VIDEO_EXTENSIONS, cached_still, is_clip, render_clip
+        from dip_studio.image_io import (
+            EXPORT_FORMATS, WORKING_MAX_SIDE, cached_decode, cached_display, cached_export, image_size,
+        )
+        from dip_studio.pipeline import cache_key
+        from dip_studio.preview import PREVIEW_MAX_SIDE
+        
         # Load and process image
         try:
-            pil_image = Image.open(uploaded_file)
-            image = np.array(pil_image)
+            cache = get_result_cache()
+            data = uploaded_file.getvalue()
+            digest = content_digest(data)
             
-            # Ensure RGB format
-            if len(image.shape) == 2:
-                image = np.stack([image] * 3, axis=-1)
-            elif image.shape[2] == 4:
-                image = image[:, :, :3]
+            # Clips preview and download their first frame like any image
+            suffix = os.path.splitext(uploaded_file.name)[1].lower()
+            clip_data = data if is_clip(data, suffix) else None
+            if suffix in VIDEO_EXTENSIONS:
+                data = cached_still(cache, digest, data, suffix)
             
-            # Apply filter
-            processed_image = image.copy()
+            full_resolution = True
+            if progressive and max(image_size(data)) > PREVIEW_MAX_SIDE:
+                full_resolution = st.toggle(
+                    "🔍 Full resolution", value=False,
+                    help="Filter at working resolution for native-size viewing; downloads are always full resolution"
+                )
             
-            with st.spinner(f"Applying {selected_filter}..."):
-                if selected_filter == "Grayscale":
-                    processed_image = numpy_grayscale(image)
-                elif selected_filter == "Invert":
-                    processed_image = numpy_invert(image)
-                elif selected_filter == "Threshold":
-                    processed_image = numpy_threshold(image, filter_params.get("threshold", 128))
-                elif selected_filter == "Brightness":
-                    processed_image = numpy_brightness(image, filter_params.get("value", 0))
-                elif selected_filter == "Contrast":
-                    processed_image = numpy_contrast(image, filter_params.get("factor", 1.0))
-                elif selected_filter == "Sharpen":
-                    processed_image = numpy_sharpen(image, filter_params.get("strength", 1.0))
-                elif selected_filter == "Gaussian Blur":
-                    processed_image = numpy_gaussian_blur(image, filter_params.get("kernel_size", 5), filter_params.get("sigma", 1.0))
-                elif selected_filter == "Box Blur":
-                    processed_image = numpy_box_blur(image, filter_params.get("kernel_size", 5))
-                elif selected_filter == "Median Filter":
-                    processed_image = numpy_median_filter(image, filter_params.get("kernel_size", 3))
-                elif selected_filter == "Sobel":
-                    processed_image = numpy_sobel_edge(image)
-                elif selected_filter == "Laplacian":
-                    processed_image = numpy_laplacian(image)
-                elif selected_filter == "Sepia":
-                    processed_image = numpy_sepia(image)
-                elif selected_filter == "Emboss":
-                    processed_image = numpy_emboss(image)
+            # Decode only as much resolution as is being worked at
+            max_side = WORKING_MAX_SIDE if full_resolution else PREVIEW_MAX_SIDE
+            image, scale = cached_decode(cache, digest, data, max_side)
             
+            # Apply recipe steps, then the selected filter
+            steps = list(recipe)
             if selected_filter != "None":
-                st.toast(f"✅ {selected_filter} filter applied!", icon="🎨")
+                steps.append((selected_filter, filter_params))
+            step_names = " → ".join(name for name, _ in steps)
+            
+            # Cached arrays are read-only, so the original can stand in unfiltered
+            original_key = processed_key = ("decoded", digest, scale)
+            processed_image, pending = image, None
+            if steps:
+                # Filter in the background; a newer rerun of this session cancels a stale job
+                session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+                jobs = get_session_jobs()
+                processed_key = cache_key(digest, steps, scale)
+                finished = cache.get(processed_key)
+                if finished is not None:
+                    # Already filtered: no job needed, and a stale one can stop
+                    jobs.cancel(session_id)
+                    processed_image = finished
+                else:
+                    # The job thread records the filter itself; this rerun only times its wait
+                    with profile_stage("filter wait", steps=step_names, scale=scale):
+                        job = jobs.submit(session_id, processed_key, filter_job, cache, digest, image, steps, scale)
+                        wait([job], timeout=JOB_WAIT_SECONDS)
+                    if job.done():
+                        processed_image = job.result()
+                    else:
+                        # Show the last finished result of this image meanwhile, or the original
+                        pending, processed_key = job, original_key
+                        completed_key = jobs.last_completed(session_id)
+                        if completed_key is not None and completed_key[1] == digest:
+                            completed = cache.get(completed_key)
+                            if completed is not None:
+                                processed_key, processed_image = completed_key, completed
+                if pending is None:
+                    st.toast(f"✅ {step_names} applied!", icon="🎨")
             
             # Display images side by side
             col1, col2 = st.columns(2)
@@ -631,43 +366,66 @@ def main():
                     <div class="card-label label-original">📷 Original</div>
                 </div>
                 """, unsafe_allow_html=True)
-                st.image(image, use_container_width=True)
+                with profile_stage("display", image="original"):
+                    st.image(cached_display(cache, original_key, image), use_container_width=True)
             
             with col2:
-                label = f"🎨 {selected_filter}" if selected_filter != "None" else "🎨 Processed"
+                label = f"🎨 {step_names}" if steps else "🎨 Processed"
+                if pending is not None:
+                    label = f"⏳ Applying {step_names}..."
                 st.markdown(f"""
                 <div class="image-card">
                     <div class="card-label label-processed">{label}</div>
                 </div>
                 """, unsafe_allow_html=True)
-                st.image(processed_image, use_container_width=True)
+                with profile_stage("display", image="processed"):
+                    st.image(cached_display(cache, processed_key, processed_image), use_container_width=True)
+                if pending is not None:
+                    rerun_when_done(pending)
             
-            # Download section
-            if selected_filter != "None":
+            # Download section, in preview mode too: exports decode and filter at full resolution
+            if steps:
                 st.markdown("---")
                 st.markdown("### 💾 Download Processed Image")
                 
-                pil_processed = Image.fromarray(processed_image)
-                filter_name = selected_filter.lower().replace(" ", "_")
-                
-                col_d1, col_d2, col_d3 = st.columns(3)
+                if scale < 1:
+                    limit = WORKING_MAX_SIDE if full_resolution else PREVIEW_MAX_SIDE
+                    st.caption(
+                        f"{'Working' if full_resolution else 'Previewing'} at 1/{round(1 / scale)} scale "
+                        f"(longest side ≤ {limit} px); downloads are rendered at full resolution."
+                    )
                 
-                with col_d1:
-                    buf = io.BytesIO()
-                    pil_processed.save(buf, format='PNG')
-                    st.download_button("⬇️ PNG", buf.getvalue(), f"processed_{filter_name}.png", "image/png", use_container_width=True)
+                filter_name = "_".join(name.lower().replace(" ", "_") for name, _ in steps)
                 
-                with col_d2:
-                    buf = io.BytesIO()
-                    if pil_processed.mode != 'RGB':
-                        pil_processed = pil_processed.convert('RGB')
-                    pil_processed.save(buf, format='JPEG', quality=95)
-                    st.download_button("⬇️ JPEG", buf.getvalue(), f"processed_{filter_name}.jpg", "image/jpeg", use_container_width=True)
-                
-                with col_d3:
-                    buf = io.BytesIO()
-                    pil_processed.save(buf, format='WebP', quality=95)
-                    st.download_button("⬇️ WebP", buf.getvalue(), f"processed_{filter_name}.webp", "image/webp", use_container_width=True)
+                # Nothing is decoded at full size, filtered or encoded until a button is clicked
+                for column, (fmt, (ext, mime, _)) in zip(st.columns(3), EXPORT_FORMATS.items()):
+                    with column:
+                        st.download_button(
+                            f"⬇️ {fmt}", partial(cached_export, cache, digest, data, steps, fmt),
+                            f"processed_{filter_name}.{ext}", mime, on_click="ignore", use_container_width=True
+                        )
+            
+            # Every frame of a clip, streamed through the same steps at full resolution
+            if steps and clip_data is not None:
+                st.markdown("---")
+                st.markdown("### 🎞️ Process Clip")
+                clip_fmt = "MP4" if suffix in VIDEO_EXTENSIONS else "GIF"
+                ext, mime = CLIP_FORMATS[clip_fmt]
+                clip_key = ("clip", cache_key(digest, steps), clip_fmt)
+                rendered = cache.get(clip_key)
+                if rendered is None and st.button(f"🎞️ Render {clip_fmt}", use_container_width=True):
+                    with st.spinner(f"Applying {step_names} to every frame..."):
+                        encoded, count, seconds = render_clip(clip_data, suffix, steps, clip_fmt)
+                    rendered = cache.put(clip_key, np.frombuffer(encoded, dtype=np.uint8))
+                    st.session_state["clip_rate"] = (clip_key, count, seconds)
+                if rendered is not None:
+                    rate_key, count, seconds = st.session_state.get("clip_rate", (None, 0, 0))
+                    if rate_key == clip_key:
+                        st.caption(f"{count} frames in {seconds:.1f} s · {count / seconds:.1f} frames/s")
+                    st.download_button(
+                        f"⬇️ {clip_fmt}", rendered.tobytes(), f"processed_{filter_name}.{ext}", mime,
+                        on_click="ignore", use_container_width=True
+                    )
         
         except Exception as e:
             st.error(f"❌ Error processing image: {str(e)}")
@@ -702,4 +460,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with profile_request("rerun") as trace:
+        main()
+    if PROFILE:
+        show_profile_panel(trace)
@@ -0,0 +1,84 @@
+"""
+Wall-clock and peak-memory profile of whole-image versus per-channel filtering.
+
+"per-channel" reproduces the old behaviour of recursing once per RGB plane
+(for convolution, the previous implementation verbatim); "vectorized"
+hands the full HxWxC array to the current filter. NumPy reports its buffers to tracemalloc, so the peak shown
+is the largest amount of array memory alive during the call.
+
+Run from the repository root:
+    python -m benchmarks.channels [--size 2048x1536]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from dip_studio.filters import numpy_convolve2d, numpy_median_filter
+
+SHARPEN = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float64)
+
+
+
+def legacy_convolve2d(image, kernel):
+    """numpy_convolve2d before channel vectorization."""
+    if len(image.shape) == 3:
+        result = np.zeros_like(image, dtype=np.float64)
+        for c in range(image.shape[2]):
+            result[:, :, c] = legacy_convolve2d(image[:, :, c], kernel)
+        return np.clip(result, 0, 255).astype(np.uint8)
+    image = image.astype(np.float64)
+    kh, kw = kernel.shape
+    padded = np.pad(image, ((kh // 2, kh // 2), (kw // 2, kw // 2)), mode='reflect')
+    output = np.zeros_like(image, dtype=np.float64)
+    for i in range(kh):
+        for j in range(kw):
+            output += kernel[i, j] * padded[i:i+image.shape[0], j:j+image.shape[1]]
+    return np.clip(output, 0, 255).astype(np.uint8)
+
+
+def legacy_median_filter(image, kernel_size):
+    """numpy_median_filter with the old per-channel recursion."""
+    result = np.zeros_like(image)
+    for c in range(image.shape[2]):
+        result[:, :, c] = numpy_median_filter(image[:, :, c], kernel_size)
+    return result
+
+
+CASES = {
+    "convolve 3x3": (lambda image: legacy_convolve2d(image, SHARPEN),
+                     lambda image: numpy_convolve2d(image, SHARPEN, "direct")),
+    "median 5x5": (lambda image: legacy_median_filter(image, 5),
+                   lambda image: numpy_median_filter(image, 5)),
+}
+
+
+def profile(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="2048x1536", help="image size as WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    print(f"{'case':<18} {'mode':<11} {'seconds':>9} {'peak MB':>9}")
+    for name, (before, after) in CASES.items():
+        for mode, func in (("per-channel", before), ("vectorized", after)):
+            elapsed, peak = profile(lambda: func(image))
+            print(f"{name:<18} {mode:<11} {elapsed:>9.3f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
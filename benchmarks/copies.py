@@ -0,0 +1,117 @@
+"""
+Full-image copies made while ingesting and displaying an upload.
+
+Copies are counted as the tracemalloc peak divided by the size of the
+decoded array, so 1.0 means the pixels were materialized once. "legacy"
+is the old path: np.array(Image.open(...)), np.stack for grayscale,
+slicing off alpha, image.copy() as the default processed image, then
+st.image's array-to-JPEG conversion on every rerun. "current" is
+decode_image plus cached display bytes; "rerun" repeats a request whose
+decode and display bytes are already cached. The display JPEG the cache
+keeps is output the page needs, not a copy of the pixels, so its size is
+left out of "current"; noise compresses badly, and below DISPLAY_MAX_WIDTH
+that JPEG is about as large as the image itself.
+
+Exits with status 1 if ingest takes more than INGEST_BUDGET copies or a
+cached rerun more than RERUN_BUDGET, plus DECODER_SLACK_BYTES either way.
+
+Run from the repository root:
+    python -m benchmarks.copies [--size 4000x3000]
+"""
+
+import argparse
+import io
+import sys
+import tracemalloc
+
+import numpy as np
+from PIL import Image, ImageFile
+
+from dip_studio.cache import ResultCache
+from dip_studio.image_io import cached_decode, cached_display
+
+INGEST_BUDGET = 1.25
+RERUN_BUDGET = 0.1  # cached bytes are handed out as they are, not copied
+# Pillow reads encoded data MAXBLOCK bytes at a time whatever the image
+# size; both budgets allow that much on top, which only matters for small images
+DECODER_SLACK_BYTES = 2 * ImageFile.MAXBLOCK
+
+
+def legacy_request(data):
+    image = np.array(Image.open(io.BytesIO(data)))
+    if len(image.shape) == 2:
+        image = np.stack([image] * 3, axis=-1)
+    elif image.shape[2] == 4:
+        image = image[:, :, :3]
+    processed = image.copy()
+    for shown in (image, processed):
+        # What st.image does with an array
+        Image.fromarray(shown.astype(np.uint8)).save(io.BytesIO(), format="JPEG", quality=100)
+    return image
+
+
+def current_request(cache, data):
+    image, scale = cached_decode(cache, "digest", data)
+    for shown in (image, image):
+        cached_display(cache, ("decoded", "digest", scale), shown)
+    return image
+
+
+def traced_peak(func, *args):
+    """(tracemalloc peak in bytes, result) for one call."""
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, result
+
+
+def request_copies(data):
+    """(legacy, ingest, cached rerun) copies for one upload, and the decoded array."""
+    legacy_peak, legacy = traced_peak(legacy_request, data)
+    cache = ResultCache()
+    ingest_peak, image = traced_peak(current_request, cache, data)
+    display_bytes = cache.size_bytes - image.nbytes
+    rerun_peak = traced_peak(current_request, cache, data)[0]
+    return (legacy_peak / legacy.nbytes, (ingest_peak - display_bytes) / image.nbytes,
+            rerun_peak / image.nbytes, image)
+
+
+def within_budget(copies, budget, image):
+    return copies * image.nbytes <= budget * image.nbytes + DECODER_SLACK_BYTES
+
+
+def sample_uploads(width, height):
+    """Encoded noise uploads by label: RGB JPEG, grayscale PNG, RGBA PNG."""
+    rgb = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    uploads = {}
+    for label, mode, fmt in (("RGB JPEG", "RGB", "JPEG"), ("grayscale PNG", "L", "PNG"), ("RGBA PNG", "RGBA", "PNG")):
+        buf = io.BytesIO()
+        Image.fromarray(rgb).convert(mode).save(buf, format=fmt)
+        uploads[label] = buf.getvalue()
+    return uploads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="image size as WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    failures = []
+    print(f"{'upload':<15} {'legacy':>8} {'current':>8} {'rerun':>8}   (full-image copies)")
+    for label, data in sample_uploads(width, height).items():
+        legacy, current, rerun, image = request_copies(data)
+        print(f"{label:<15} {legacy:>8.2f} {current:>8.2f} {rerun:>8.2f}   {image.shape}")
+        if not within_budget(current, INGEST_BUDGET, image):
+            failures.append(f"{label}: ingest made {current:.2f} copies (budget {INGEST_BUDGET})")
+        if not within_budget(rerun, RERUN_BUDGET, image):
+            failures.append(f"{label}: cached rerun made {rerun:.2f} copies (budget {RERUN_BUDGET})")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
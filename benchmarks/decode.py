@@ -0,0 +1,95 @@
+"""
+Decode time and memory of a large JPEG at full, working and preview resolution.
+
+"full" is the old load path (decode everything); "working" and "preview"
+decode at WORKING_MAX_SIDE and PREVIEW_MAX_SIDE, using JPEG DCT scaling
+where possible. Pillow's decoder
+buffers are not visible to tracemalloc, so each case runs in a fresh
+process and reports its peak resident memory above the post-import level.
+
+Run from the repository root:
+    python -m benchmarks.decode [--input photo.jpg] [--size 6000x4000] [--repeat 3]
+"""
+
+import argparse
+import io
+import multiprocessing
+import resource
+import time
+
+import numpy as np
+from PIL import Image
+
+from dip_studio.image_io import WORKING_MAX_SIDE, decode_image, image_size, reduction_for
+from dip_studio.preview import PREVIEW_MAX_SIDE
+
+
+def synthetic_jpeg(width, height):
+    """A photo-like JPEG: smooth gradients plus mild noise, quality 90."""
+    y, x = np.mgrid[0:height, 0:width]
+    noise = np.random.default_rng(0).integers(-20, 20, (height, width, 3))
+    image = np.stack([x * 255 // width, y * 255 // height, (x + y) % 256], axis=-1) + noise
+    buf = io.BytesIO()
+    Image.fromarray(np.clip(image, 0, 255).astype(np.uint8)).save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+def _peak_rss():
+    """Peak resident bytes of this process (VmHWM on Linux, which exec resets)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _run_case(data, max_side, repeat, queue):
+    """Child process: best decode time and peak RSS growth for one case."""
+    baseline = _peak_rss()
+    reduction = reduction_for(image_size(data), max_side)
+    decode = lambda: decode_image(data, reduction)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = decode()
+        best = min(best, time.perf_counter() - start)
+        del image
+    peak = _peak_rss() - baseline
+    queue.put((best, peak, decode().shape))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", help="JPEG to decode (default: a synthetic photo of --size)")
+    parser.add_argument("--size", default="6000x4000", help="synthetic image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="decodes per case (best is kept)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "rb") as f:
+            data = f.read()
+    else:
+        data = synthetic_jpeg(*(int(v) for v in args.size.lower().split("x")))
+    width, height = image_size(data)
+    print(f"{width}x{height} ({width * height / 1e6:.1f} MP), {len(data) / 2**20:.1f} MB encoded\n")
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'path':<22} {'shape':>16} {'seconds':>9} {'peak MB':>9} {'speedup':>8}")
+    reference = None
+    for label, max_side in (("full", None), (f"working ({WORKING_MAX_SIDE})", WORKING_MAX_SIDE),
+                            (f"preview ({PREVIEW_MAX_SIDE})", PREVIEW_MAX_SIDE)):
+        queue = context.Queue()
+        process = context.Process(target=_run_case, args=(data, max_side, args.repeat, queue))
+        process.start()
+        seconds, peak, shape = queue.get()
+        process.join()
+        reference = reference or seconds
+        shape = "x".join(map(str, shape))
+        print(f"{label:<22} {shape:>16} {seconds:>9.3f} {peak / 2**20:>9.1f} {reference / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Edge engine versus the 3x3 correlations it replaced.
+
+"correlate" runs Sobel and Laplacian as before: one direct 3x3 correlation
+of the grayscale plane per kernel (gx, gy, Laplacian). "engine" derives
+the same outputs from shared int16 row passes. Both are checked for
+identical results first; exits with status 1 on any mismatch.
+
+Run from the repository root:
+    python -m benchmarks.edges [--size 2048x1536] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dip_studio.filters import numpy_correlate, numpy_edge_features, numpy_grayscale
+
+SOBEL_X = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float64)
+SOBEL_Y = SOBEL_X.T.copy()
+LAPLACIAN = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=np.float64)
+
+
+def correlate_edges(image, outputs):
+    """Sobel magnitude and |Laplacian| via separate direct correlations."""
+    gray = numpy_grayscale(image)
+    result = {}
+    if "magnitude" in outputs:
+        gx = numpy_correlate(gray, SOBEL_X, "direct")
+        gy = numpy_correlate(gray, SOBEL_Y, "direct")
+        result["magnitude"] = np.sqrt(gx**2 + gy**2)
+    if "laplacian" in outputs:
+        result["laplacian"] = np.abs(numpy_correlate(gray, LAPLACIAN, "direct"))
+    return result
+
+
+def measure(func, repeat):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="2048x1536", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    failures = []
+    print(f"{'outputs':<22} {'method':<10} {'seconds':>9} {'peak MB':>9} {'speedup':>8}")
+    for outputs in (("magnitude",), ("laplacian",), ("magnitude", "laplacian")):
+        expected = correlate_edges(image, outputs)
+        actual = numpy_edge_features(image, outputs)
+        failures += [name for name in outputs if not np.array_equal(expected[name], actual[name])]
+
+        label = " + ".join(outputs)
+        reference, peak = measure(lambda: correlate_edges(image, outputs), args.repeat)
+        print(f"{label:<22} {'correlate':<10} {reference:>9.3f} {peak / 2**20:>9.1f} {1:>7.2f}x")
+        seconds, peak = measure(lambda: numpy_edge_features(image, outputs), args.repeat)
+        print(f"{label:<22} {'engine':<10} {seconds:>9.3f} {peak / 2**20:>9.1f} {reference / seconds:>7.2f}x")
+
+    seconds, peak = measure(lambda: numpy_edge_features(image, ("magnitude", "direction", "thin")), args.repeat)
+    print(f"{'magnitude+dir+thin':<22} {'engine':<10} {seconds:>9.3f} {peak / 2**20:>9.1f}")
+
+    if failures:
+        print(f"\nEngine output differs from correlation for: {', '.join(sorted(set(failures)))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+NumPy reference filters versus their OpenCV drop-ins: parity, then speed.
+
+Parity runs every OpenCV filter against its NumPy reference on random and
+smooth images, colour and grayscale, at odd sizes. Integer work must match
+exactly; float kernels (Gaussian, box, sharpen at other strengths, sepia)
+may differ by one grey level where a sum, in float32 or in another order,
+lands on the other side of an integer. Kernel size 1, which preview
+scaling produces at 1/4 and 1/8 scale, is included. The border (the
+kernel radius around the edge) is checked on its own, and the same blur
+with BORDER_REFLECT and BORDER_REPLICATE shows that only
+BORDER_REFLECT_101 matches np.pad(mode='reflect'). Tiled
+and band-parallel runs under the 'opencv' engine must equal one
+whole-image call; with DIP_PRECISION=float32 they may differ from it by
+the same one grey level, as OpenCV rounds the last columns of a row
+differently. Exits with status 1 if any bound is broken.
+
+Run from the repository root:
+    python -m benchmarks.engines [--size 2048x1536] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from dip_studio import registry
+from dip_studio.filters import PRECISION, gaussian_kernel
+from dip_studio.opencv_filters import OPENCV_FILTERS
+from dip_studio.parallel import numpy_parallel_filter
+from dip_studio.registry import FILTERS, filter_kwargs, filter_spec
+from dip_studio.tiling import numpy_tiled_filter
+
+CASES = [
+    ("Threshold", {"threshold": 100}),
+    ("Sharpen", {}),
+    ("Sharpen", {"strength": 1.7}),
+    ("Gaussian Blur", {"kernel_size": 1, "sigma": 0.125}),
+    ("Gaussian Blur", {"kernel_size": 5, "sigma": 1.0}),
+    ("Gaussian Blur", {"kernel_size": 15, "sigma": 3.0}),
+    ("Box Blur", {"kernel_size": 1}),
+    ("Box Blur", {"kernel_size": 5}),
+    ("Box Blur", {"kernel_size": 15}),
+    ("Median Filter", {"kernel_size": 1}),
+    ("Median Filter", {"kernel_size": 3}),
+    ("Median Filter", {"kernel_size": 9}),
+    ("Sobel", {}),
+    ("Laplacian", {}),
+    ("Sepia", {}),
+    ("Emboss", {}),
+]
+# Largest allowed |difference| in grey levels; the rest must be exact
+TOLERANCE = {"Gaussian Blur": 1, "Box Blur": 1, "Sharpen": 1, "Sepia": 1}
+
+
+def sample_images(height, width):
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    ramp = np.add.outer(np.arange(height), 2 * np.arange(width)) % 256
+    smooth = np.stack([ramp, ramp[::-1], ramp[:, ::-1]], axis=-1).astype(np.uint8)
+    return {"noise": noise, "smooth": smooth, "noise gray": noise[..., 0].copy(), "smooth gray": smooth[..., 0].copy()}
+
+
+def border_mask(shape, width):
+    mask = np.ones(shape[:2], dtype=bool)
+    if width:
+        mask[width:-width, width:-width] = False
+    return mask
+
+
+def parity_rows(images, cases=CASES):
+    """(filter, params, image, max diff, differing pixels, border max diff, allowed) per case."""
+    rows = []
+    for name, params in cases:
+        kwargs = filter_kwargs(name, params)
+        border = border_mask(next(iter(images.values())).shape, max(FILTERS[name].halo(kwargs), 1))
+        for label, image in images.items():
+            reference = FILTERS[name].function(image, **kwargs).astype(np.int16)
+            diff = np.abs(filter_spec(name, "opencv").function(image, **kwargs) - reference)
+            rows.append((name, params, label, int(diff.max()), np.count_nonzero(diff), int(diff[border].max()),
+                         TOLERANCE.get(name, 0)))
+    return rows
+
+
+def border_mode_rows(image):
+    """Border-frame mismatches of a Gaussian blur against the reference, per OpenCV border mode."""
+    kernel_size, sigma = 7, 1.5
+    reference = FILTERS["Gaussian Blur"].function(image, kernel_size, sigma).astype(np.int16)
+    border = border_mask(image.shape, kernel_size // 2)
+    rows = []
+    for label, mode in (("REFLECT_101", cv2.BORDER_REFLECT_101), ("REFLECT", cv2.BORDER_REFLECT),
+                        ("REPLICATE", cv2.BORDER_REPLICATE)):
+        result = cv2.filter2D(image, cv2.CV_32F, gaussian_kernel(kernel_size, sigma), borderType=mode)
+        diff = np.abs(np.clip(result, 0, 255).astype(np.uint8) - reference)
+        rows.append((label, np.count_nonzero(diff[border]), int(diff[border].max())))
+    return rows
+
+
+def engine_wiring_rows(image):
+    """Max |difference| of tiled and 3-band runs under the 'opencv' engine from one whole-image call."""
+    rows = []
+    previous, registry.ENGINE = registry.ENGINE, "opencv"
+    try:
+        for name, params in CASES:
+            whole = OPENCV_FILTERS[name][0](image, **filter_kwargs(name, params)).astype(np.int16)
+            tiled = numpy_tiled_filter(image, name, params, tile_size=(96, 128))
+            banded = numpy_parallel_filter(image, name, params, workers=3)
+            rows.append((name, params, int(np.abs(tiled - whole).max()), int(np.abs(banded - whole).max())))
+    finally:
+        registry.ENGINE = previous
+    return rows
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="2048x1536", help="benchmark image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'filter':<14} {'params':<30} {'image':<12} {'max':>4} {'differ':>7} {'border':>7} {'allowed':>8}")
+    for name, params, label, worst, differ, border, allowed in parity_rows(sample_images(203, 301)):
+        ok = worst <= allowed
+        failed |= not ok
+        print(f"{name:<14} {str(params):<30} {label:<12} {worst:>4} {differ:>7} {border:>7} {allowed:>8}"
+              + ("" if ok else "  FAIL"))
+
+    smooth = sample_images(203, 301)["smooth"]
+    print(f"\n{'border mode':<12} {'border px differing':>20} {'max':>4}   (7x7 Gaussian vs np.pad reflect)")
+    for label, differ, worst in border_mode_rows(smooth):
+        print(f"{label:<12} {differ:>20} {worst:>4}")
+        failed |= label == "REFLECT_101" and worst > TOLERANCE["Gaussian Blur"]
+
+    print(f"\n{'filter':<14} {'params':<30} {'tiled':>6} {'bands':>6}   ('opencv' engine, max diff vs one call)")
+    for name, params, tiled, banded in engine_wiring_rows(smooth):
+        allowed = 0 if PRECISION == "float64" else TOLERANCE.get(name, 0)
+        ok = max(tiled, banded) <= allowed
+        failed |= not ok
+        print(f"{name:<14} {str(params):<30} {tiled:>6} {banded:>6}" + ("" if ok else "  FAIL"))
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = sample_images(height, width)["noise"]
+    print(f"\n{'filter':<14} {'params':<30} {'numpy s':>8} {'opencv s':>9} {'speedup':>8}")
+    for name, params in CASES:
+        kwargs = filter_kwargs(name, params)
+        reference = best_time(lambda: FILTERS[name].function(image, **kwargs), args.repeat)
+        drop_in = best_time(lambda: filter_spec(name, "opencv").function(image, **kwargs), args.repeat)
+        print(f"{name:<14} {str(params):<30} {reference:>8.3f} {drop_in:>9.3f} {reference / drop_in:>7.1f}x")
+
+    if failed:
+        print("\nparity bound broken")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
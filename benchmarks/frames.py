@@ -0,0 +1,105 @@
+"""
+Frame streaming throughput and peak memory versus clip length.
+
+Synthetic clips (a moving gradient with noise) are written as MP4 and GIF
+at each length and streamed through one filter. "stream" is
+frames.process_clip: lazy decode, a bounded pool and in-order writing.
+"eager" decodes every frame into a list first, then filters and writes
+them, the way a single-image pipeline would handle a clip. Peak memory is
+NumPy and Python allocations traced by tracemalloc (OpenCV's own buffers
+are not included); streaming should stay flat as the clip grows. Streamed
+frames are also checked against apply_pipeline on each decoded frame.
+
+Run from the repository root:
+    python -m benchmarks.frames [--size 640x360] [--lengths 60,240] [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from dip_studio.batch import parse_step
+from dip_studio.frames import (
+    _GifWriter, _VideoWriter, filter_frames, iter_frames, process_clip,
+)
+from dip_studio.pipeline import apply_pipeline
+
+
+def synthetic_frames(count, width, height):
+    rng = np.random.default_rng(0)
+    ramp = np.add.outer(np.arange(height), np.arange(width))
+    for index in range(count):
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        for channel in range(3):
+            frame[..., channel] = (ramp + 4 * index + 85 * channel) % 256
+        frame[rng.random((height, width)) < 0.02] = 255
+        yield frame, 40
+
+
+def write_clip(path, frames):
+    writer = (_GifWriter if path.endswith(".gif") else _VideoWriter)(path)
+    try:
+        for frame, duration in frames:
+            writer.write(frame, duration)
+    finally:
+        writer.close()
+
+
+def eager_clip(path, out_path, steps):
+    frames = list(iter_frames(path))
+    results = [(apply_pipeline(frame, steps), duration) for frame, duration in frames]
+    write_clip(out_path, results)
+    return len(results)
+
+
+def traced(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def check_order(path, steps, workers):
+    streamed = filter_frames(iter_frames(path), steps, workers)
+    for (frame, _), (result, _) in zip(iter_frames(path), streamed):
+        if not np.array_equal(apply_pipeline(frame, steps), result):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="640x360", help="frame size as WIDTHxHEIGHT")
+    parser.add_argument("--lengths", default="60,240", help="comma-separated clip lengths in frames")
+    parser.add_argument("--workers", type=int, default=None, help="frame worker threads (default: DIP_FRAME_WORKERS)")
+    parser.add_argument("--step", type=parse_step, default=parse_step("Gaussian Blur:kernel_size=7,sigma=2"),
+                        help="filter step (default 'Gaussian Blur:kernel_size=7,sigma=2')")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    steps = [args.step]
+    print(f"{'clip':<10} {'frames':>7} {'mode':<7} {'seconds':>8} {'frames/s':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ("mp4", "gif"):
+            for count in (int(v) for v in args.lengths.split(",")):
+                path = os.path.join(tmp, f"clip{count}.{ext}")
+                write_clip(path, synthetic_frames(count, width, height))
+                out_path = os.path.join(tmp, f"out.{ext}")
+                for mode, run in (
+                    ("stream", lambda: process_clip(path, out_path, steps, args.workers)[0]),
+                    ("eager", lambda: eager_clip(path, out_path, steps)),
+                ):
+                    written, seconds, peak = traced(run)
+                    print(f"{ext:<10} {written:>7} {mode:<7} {seconds:>8.2f} {written / seconds:>9.1f} {peak / 2**20:>8.1f}")
+            print(f"{ext} streamed frames match apply_pipeline, in order: {check_order(path, steps, args.workers)}")
+
+
+if __name__ == "__main__":
+    main()
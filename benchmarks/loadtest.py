@@ -0,0 +1,137 @@
+"""
+Load test for the HTTP processing service.
+
+Fires --requests POSTs of one synthetic image at --concurrency clients and
+reports throughput, p50/p99 latency of the successful requests and how
+many were turned away with 503. Without --url a local service is started
+with --workers and --queue-depth and stopped afterwards. With --batch N
+each request is a /batch of N images instead of one /filters call.
+
+Run from the repository root:
+    python -m benchmarks.loadtest [--requests 200] [--concurrency 8] [--size 1024x768]
+    python -m benchmarks.loadtest --url http://127.0.0.1:8502 --filter Sharpen
+"""
+
+import argparse
+import io
+import json
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+
+def synthetic_png(width, height):
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(image).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def multipart(fields, files):
+    """(body, content type) of a multipart/form-data request."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for filename, data in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="images"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def start_service(workers, queue_depth):
+    """Start a local service on a free port; returns (process, base URL)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    command = [sys.executable, "-m", "dip_studio.service", "--port", str(port)]
+    if workers:
+        command += ["--workers", str(workers)]
+    if queue_depth is not None:
+        command += ["--queue-depth", str(queue_depth)]
+    process = subprocess.Popen(command)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f"{url}/health", timeout=1).read()
+            return process, url
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("service did not start")
+
+
+def send(url, body, content_type):
+    """(status, seconds) of one request."""
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="running service to test (default: start a local one)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="clients sending at once")
+    parser.add_argument("--size", default="1024x768", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--filter", default="Gaussian Blur", help="registry name")
+    parser.add_argument("--batch", type=int, default=0, help="images per /batch request (default: single /filters calls)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes of the local service")
+    parser.add_argument("--queue-depth", type=int, default=None, help="queue depth of the local service")
+    args = parser.parse_args()
+
+    image = synthetic_png(*(int(v) for v in args.size.lower().split("x")))
+    if args.batch:
+        recipe = json.dumps([[args.filter, {}]])
+        body, content_type = multipart({"recipe": recipe}, [(f"{i}.png", image) for i in range(args.batch)])
+        path = "/batch"
+    else:
+        body, content_type = image, "application/octet-stream"
+        path = "/filters/" + urllib.parse.quote(args.filter)
+
+    process, url = (None, args.url.rstrip("/")) if args.url else start_service(args.workers, args.queue_depth)
+    try:
+        send(url + path, body, content_type)  # warm the worker pool
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as clients:
+            results = list(clients.map(lambda _: send(url + path, body, content_type), range(args.requests)))
+        elapsed = time.perf_counter() - start
+        health = json.loads(urllib.request.urlopen(f"{url}/health").read())
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    latencies = np.array([seconds for status, seconds in results if status == 200])
+    rejected = sum(status == 503 for status, _ in results)
+    errors = len(results) - len(latencies) - rejected
+    images = len(latencies) * (args.batch or 1)
+    print(f"{url}{path}: {args.requests} requests, {args.concurrency} clients, "
+          f"{health['workers']} workers, capacity {health['capacity']}")
+    print(f"ok {len(latencies)}, rejected (503) {rejected}, errors {errors} in {elapsed:.2f} s")
+    if len(latencies):
+        print(f"throughput {len(latencies) / elapsed:.1f} requests/s, {images / elapsed:.1f} images/s")
+        print(f"latency p50 {np.percentile(latencies, 50) * 1000:.0f} ms, p99 {np.percentile(latencies, 99) * 1000:.0f} ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
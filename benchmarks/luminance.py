@@ -0,0 +1,89 @@
+"""
+Luminance plane: float64 np.dot versus exact integer weights, and its reuse.
+
+"np.dot" is the old conversion, a float64 matrix-vector product per block
+of rows; "lut sum" adds three per-channel int32 tables; "int32" is the
+integer-weighted path numpy_grayscale now uses. Planes that differ from
+np.dot are counted: np.dot truncates a float sum that lands just below an
+exact integer, so a few colours come out one level darker. "switch" times
+Sobel, Laplacian and Threshold in turn on one cached (read-only) image, which
+converts once with the memo and three times without.
+
+Run from the repository root:
+    python -m benchmarks.luminance [--size 4000x3000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from dip_studio.filters import LUMA_WEIGHTS, _luminance, _row_blocks, numpy_grayscale
+from dip_studio.registry import FILTERS
+
+_TABLES = [np.arange(256, dtype=np.int32) * weight for weight in LUMA_WEIGHTS]
+
+
+def dot_luminance(image):
+    gray = np.empty(image.shape[:2], dtype=np.uint8)
+    for rows in _row_blocks(image):
+        gray[rows] = np.dot(image[rows, :, :3], [0.299, 0.587, 0.114])
+    return gray
+
+
+def lut_luminance(image):
+    gray = np.empty(image.shape[:2], dtype=np.uint8)
+    for rows in _row_blocks(image, bytes_per_sample=4):
+        block = image[rows]
+        total = np.take(_TABLES[0], block[..., 0])
+        total += np.take(_TABLES[1], block[..., 1])
+        total += np.take(_TABLES[2], block[..., 2])
+        gray[rows] = np.floor_divide(total, 1000, out=total)
+    return gray
+
+
+def switch_filters(image, luminance):
+    """Sobel, Laplacian and Threshold on one image, converting with luminance."""
+    for name in ("Sobel", "Laplacian", "Threshold"):
+        FILTERS[name].function(luminance(image))
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    reference = dot_luminance(image)
+
+    print(f"{'path':<10} {'seconds':>9} {'speedup':>8} {'differ':>9} {'max diff':>9}")
+    baseline = None
+    for label, func in (("np.dot", dot_luminance), ("lut sum", lut_luminance), ("int32", _luminance)):
+        seconds = best_time(lambda: func(image), args.repeat)
+        baseline = baseline or seconds
+        diff = np.abs(func(image).astype(np.int16) - reference)
+        print(f"{label:<10} {seconds:>9.3f} {baseline / seconds:>7.2f}x {np.count_nonzero(diff):>9} {diff.max():>9}")
+
+    cached = image.copy()
+    cached.setflags(write=False)
+    print(f"\n{'switch':<10} {'seconds':>9} {'speedup':>8}   (Sobel, Laplacian, Threshold on one upload)")
+    baseline = best_time(lambda: switch_filters(image, dot_luminance), args.repeat)
+    print(f"{'np.dot x3':<10} {baseline:>9.3f} {1:>7.2f}x")
+    numpy_grayscale(cached)  # memoized from here on, as after the first filter
+    seconds = best_time(lambda: switch_filters(cached, numpy_grayscale), args.repeat)
+    print(f"{'memo':<10} {seconds:>9.3f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Lookup-table point operations versus the arithmetic filters.
+
+Checks that every table result is bit-exact and reports the speedup.
+
+Run from the repository root:
+    python -m benchmarks.lut [--size 4000x3000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from dip_studio.pipeline import apply_fused
+from dip_studio.registry import FILTERS, filter_kwargs
+
+CHAINS = {
+    "brightness": [("Brightness", {"value": 40})],
+    "contrast": [("Contrast", {"factor": 1.5})],
+    "invert": [("Invert", {})],
+    "threshold": [("Threshold", {"threshold": 128})],
+    "brightness+contrast+invert": [("Brightness", {"value": 40}), ("Contrast", {"factor": 1.5}), ("Invert", {})],
+}
+
+
+def sequential(image, steps):
+    for filter_name, params in steps:
+        image = FILTERS[filter_name].function(image, **filter_kwargs(filter_name, params))
+    return image
+
+
+def best_time(func, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    mismatches = []
+    print(f"{'chain':<28} {'arithmetic s':>13} {'LUT s':>8} {'speedup':>8}")
+    for name, steps in CHAINS.items():
+        arithmetic, expected = best_time(lambda: sequential(image, steps), args.repeat)
+        table, result = best_time(lambda: apply_fused(image, steps), args.repeat)
+        if not np.array_equal(result, expected):
+            mismatches.append(name)
+        print(f"{name:<28} {arithmetic:>13.3f} {table:>8.3f} {arithmetic / table:>7.1f}x")
+
+    if mismatches:
+        print("\nNot bit-exact: " + ", ".join(mismatches))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Median filter throughput benchmark, for both NumPy median engines.
+
+Run from the repository root:
+    python -m benchmarks.median [--size 1024x768] [--repeat 3] [--max-kernel 15]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from dip_studio.filters import MEDIAN_HISTOGRAM_MIN_KERNEL, _median_histogram, _median_partition
+
+ENGINES = {"partition": _median_partition, "histogram": _median_histogram}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="1024x768", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per kernel size (best is kept)")
+    parser.add_argument("--max-kernel", type=int, default=15, help="largest kernel size to time")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    megapixels = width * height / 1e6
+
+    print(f"numpy_median_filter uses histogram from {MEDIAN_HISTOGRAM_MIN_KERNEL}x{MEDIAN_HISTOGRAM_MIN_KERNEL}")
+    print(f"{'kernel':>8} " + " ".join(f"{name + ' s':>12} {'MP/s':>8}" for name in ENGINES))
+    for kernel_size in range(3, args.max_kernel + 1, 2):
+        cells = []
+        for function in ENGINES.values():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                function(image, kernel_size)
+                best = min(best, time.perf_counter() - start)
+            cells.append(f"{best:>12.3f} {megapixels / best:>8.2f}")
+        label = f"{kernel_size}x{kernel_size}"
+        print(f"{label:>8} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
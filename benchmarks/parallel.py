@@ -0,0 +1,57 @@
+"""
+Scaling benchmark for the band-parallel executor.
+
+Reports wall time and speedup over one worker for 1, 2, 4, ... workers up
+to the core count, with each filter's default executor.
+
+Run from the repository root:
+    python -m benchmarks.parallel [--size 4000x3000] [--filters "Median Filter,Gaussian Blur"]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from dip_studio.parallel import numpy_parallel_filter
+from dip_studio.registry import FILTERS
+
+PARAMS = {"kernel_size": 9, "sigma": 2.0}
+
+
+def worker_counts(limit):
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="image size as WIDTHxHEIGHT")
+    parser.add_argument("--filters", default="Median Filter,Gaussian Blur,Sharpen,Sobel",
+                        help="comma-separated registry names")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    print(f"{'filter':<16} {'executor':<9} {'workers':>7} {'seconds':>9} {'speedup':>8}")
+    for name in args.filters.split(","):
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            # Warm the pool so start-up cost is not counted
+            numpy_parallel_filter(image[:64], name, PARAMS, workers=workers)
+            start = time.perf_counter()
+            numpy_parallel_filter(image, name, PARAMS, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{name:<16} {FILTERS[name].executor:<9} {workers:>7} {elapsed:>9.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Peak memory and accuracy of each precision mode against the float64 reference.
+
+Runs on a smooth and a noise image. Exits with status 1 if any float32 or
+fixed-point result differs from the float64 output by more than one grey
+level; tests/test_precision.py asserts the same bound for every filter.
+
+Run from the repository root:
+    python -m benchmarks.precision [--size 2048x1536]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dip_studio.filters import (
+    PRECISION_MODES,
+    numpy_box_blur,
+    numpy_emboss,
+    numpy_gaussian_blur,
+    numpy_laplacian,
+    numpy_sharpen,
+    numpy_sobel_edge,
+    numpy_thin_edges,
+)
+
+FILTERS = {
+    "gaussian 15x15": lambda image, precision: numpy_gaussian_blur(image, 15, 3.0, precision=precision),
+    "box 15x15": lambda image, precision: numpy_box_blur(image, 15, precision=precision),
+    "sharpen 1.0": lambda image, precision: numpy_sharpen(image, 1.0, precision=precision),
+    "sharpen 2.5": lambda image, precision: numpy_sharpen(image, 2.5, precision=precision),
+    "emboss": lambda image, precision: numpy_emboss(image, precision=precision),
+    "sobel": lambda image, precision: numpy_sobel_edge(image, precision=precision),
+    "laplacian": lambda image, precision: numpy_laplacian(image, precision=precision),
+    "thin edges": lambda image, precision: numpy_thin_edges(image, precision=precision),
+}
+
+TOLERANCE = 1
+
+
+def sample_images(height, width):
+    """RGB test images: uniform noise, and smooth sinusoidal shading."""
+    noise = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    y, x = np.mgrid[:height, :width]
+    shade = (127.5 + 127.5 * np.sin(x / 9.0) * np.cos(y / 13.0)).astype(np.uint8)
+    smooth = np.stack([shade, shade[::-1], shade[:, ::-1]], axis=-1)
+    return {"smooth": smooth, "noise": noise}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="2048x1536", help="image size as WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    images = sample_images(height, width)
+
+    failures = []
+    print(f"{'filter':<16} {'image':<8} {'mode':<8} {'seconds':>9} {'peak MB':>9} {'max diff':>9}")
+    for name, func in FILTERS.items():
+        for label, image in images.items():
+            reference = None
+            for precision in PRECISION_MODES:
+                tracemalloc.start()
+                start = time.perf_counter()
+                result = func(image, precision)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                if reference is None:
+                    reference = result
+                diff = int(np.abs(result.astype(np.int16) - reference).max())
+                if diff > TOLERANCE:
+                    failures.append(f"{name} on {label} ({precision}): max diff {diff}")
+                print(f"{name:<16} {label:<8} {precision:<8} {elapsed:>9.3f} {peak / 2**20:>9.1f} {diff:>9}")
+
+    if failures:
+        print("\nOutside ±%d of float64:\n  " % TOLERANCE + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Cold start and per-rerun overhead of the app, plus kernel construction.
+
+"cold" runs app.py once in a fresh process through Streamlit's AppTest
+harness and reports whether NumPy and Pillow were loaded; "eager" first
+imports the filter stack, as the app did at startup before imports were
+deferred to the first upload. Reruns are timed on the welcome page and with
+a filter selected, together with the markdown bytes each rerun re-sends
+(the inlined stylesheet included). Kernel rows compare building a
+Gaussian or sharpen kernel, and separating it, against the memoized copy.
+
+Run from the repository root:
+    python -m benchmarks.startup [--reruns 20]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+STYLESHEET = os.path.join(os.path.dirname(APP), "static", "dip_studio.css")
+
+
+def _markdown_bytes(at):
+    return sum(len(element.value) for element in at.markdown)
+
+
+def _run_app(eager, reruns, queue):
+    """Child process: cold run, rerun times and sent markdown bytes."""
+    start = time.perf_counter()
+    if eager:
+        import dip_studio.image_io, dip_studio.pipeline, dip_studio.registry  # noqa: E401,F401
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    cold = time.perf_counter() - start
+    loaded = [name for name in ("numpy", "PIL.Image") if name in sys.modules]
+
+    def rerun_times():
+        times = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+        return statistics.median(times), _markdown_bytes(at)
+
+    welcome = rerun_times()
+    at.selectbox(key="filter_category").set_value("✨ Enhancement").run()
+    at.selectbox[1].set_value("Gaussian Blur").run()
+    sidebar = rerun_times()
+    queue.put((cold, loaded, welcome, sidebar, [str(e.value) for e in at.exception]))
+
+
+def _best(func, repeat=200):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def kernel_rows():
+    import numpy as np
+
+    from dip_studio.filters import (
+        _separate_kernel, gaussian_kernel, numpy_gaussian_blur, separate_kernel, sharpen_kernel,
+    )
+
+    def uncached_blur(image, kernel_size, sigma):
+        gaussian_kernel.cache_clear()
+        _separate_kernel.cache_clear()
+        return numpy_gaussian_blur(image, kernel_size, sigma)
+
+    preview = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    kernel = gaussian_kernel(15, 3.0)
+    return [
+        ("gaussian 15x15", _best(lambda: gaussian_kernel.__wrapped__(15, 3.0)), _best(lambda: gaussian_kernel(15, 3.0))),
+        ("sharpen 1.5", _best(lambda: sharpen_kernel.__wrapped__(1.5)), _best(lambda: sharpen_kernel(1.5))),
+        ("separate 15x15", _best(lambda: _separate_kernel.__wrapped__(kernel.shape, kernel.tobytes())),
+         _best(lambda: separate_kernel(kernel))),
+        ("blur 640x480 k15", _best(lambda: uncached_blur(preview, 15, 3.0), 10),
+         _best(lambda: numpy_gaussian_blur(preview, 15, 3.0), 10)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20, help="timed reruns per page (median is kept)")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'startup':<8} {'cold s':>8} {'loaded':<18} {'welcome ms':>11} {'sidebar ms':>11} {'markdown B':>11}")
+    for eager in (True, False):
+        queue = context.Queue()
+        process = context.Process(target=_run_app, args=(eager, args.reruns, queue))
+        process.start()
+        cold, loaded, welcome, sidebar, errors = queue.get()
+        process.join()
+        label = "eager" if eager else "lazy"
+        print(f"{label:<8} {cold:>8.3f} {', '.join(loaded) or '-':<18} {welcome[0] * 1000:>11.1f} "
+              f"{sidebar[0] * 1000:>11.1f} {welcome[1]:>11}")
+        for error in errors:
+            print(f"  app raised: {error}")
+    print(f"(of which the inlined stylesheet is {os.path.getsize(STYLESHEET)} bytes per rerun)\n")
+
+    print(f"{'kernel':<18} {'built us':>9} {'memo us':>9} {'speedup':>8}")
+    for label, built, memo in kernel_rows():
+        print(f"{label:<18} {built * 1e6:>9.1f} {memo * 1e6:>9.1f} {built / memo:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
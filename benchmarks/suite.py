@@ -0,0 +1,184 @@
+"""
+Benchmark suite and regression check for every numpy_* filter.
+
+Runs each function in dip_studio.filters, and the statistics-driven ones
+in dip_studio.stats, over a grid of image sizes
+(0.3, 2, 12 and 24 MP), channel counts (1 and 3) and parameter settings.
+For each case it records the best wall time, throughput in MP/s and the
+peak memory traced during one run, and can save the results as JSON.
+
+Given a baseline (a JSON file from an earlier run on the same machine),
+exits with status 1 if any case got slower than --time-threshold or
+needs more memory than --memory-threshold. Peak memory is deterministic,
+so its threshold can be tight; timings are noisy and ignored below
+--min-seconds. The full grid takes tens of minutes (median at 24 MP
+dominates); narrow it with --sizes and --only while iterating.
+
+Run from the repository root:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json [--output current.json]
+    python -m benchmarks.suite --sizes 0.3,2 --only median --repeat 1
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dip_studio import filters, stats
+
+# Megapixels -> (height, width)
+SIZES = {
+    "0.3": (480, 640),
+    "2": (1080, 1920),
+    "12": (3000, 4000),
+    "24": (4000, 6000),
+}
+CHANNELS = (1, 3)
+
+_KERNELS = {
+    "mean3": np.full((3, 3), 1 / 9),
+    "random9": np.random.default_rng(0).random((9, 9)) / 40.5,  # non-separable
+}
+
+# Function name -> parameter settings, each a dict of keyword arguments.
+# Kernels are named so the settings serialize to JSON.
+CASES = {
+    "numpy_grayscale": [{}],
+    "numpy_invert": [{}],
+    "numpy_threshold": [{"threshold_value": 128}],
+    "numpy_brightness": [{"value": 40}],
+    "numpy_contrast": [{"factor": 1.5}],
+    "numpy_sepia": [{}],
+    "numpy_sharpen": [{"strength": 1.0}, {"strength": 2.5}],
+    "numpy_emboss": [{}],
+    "numpy_sobel_edge": [{}],
+    "numpy_laplacian": [{}],
+    "numpy_thin_edges": [{}],
+    "numpy_edge_features": [{"outputs": ("magnitude", "direction", "laplacian")}],
+    # The benchmark image is writable, so the statistics index is rebuilt on every run
+    "numpy_auto_levels": [{"clip_percent": 0.0}, {"clip_percent": 0.5}],
+    "numpy_auto_threshold": [{}],
+    "numpy_gaussian_blur": [{"kernel_size": 5, "sigma": 1.0}, {"kernel_size": 15, "sigma": 3.0}],
+    "numpy_box_blur": [{"kernel_size": 5}, {"kernel_size": 15}],
+    "numpy_median_filter": [{"kernel_size": 3}, {"kernel_size": 7}],
+    "numpy_correlate": [{"kernel": "mean3"}, {"kernel": "random9"}],
+    "numpy_convolve2d": [{"kernel": "mean3"}, {"kernel": "random9"}],
+    "numpy_integral_image": [{}],
+    "numpy_box_sum": [{"kernel_h": 15}],
+    "numpy_local_mean": [{"kernel_h": 15}],
+    "numpy_local_variance": [{"kernel_h": 15}],
+}
+
+
+def case_id(function, params, size, channels):
+    """Stable key of one case, used to match results against a baseline."""
+    args = ",".join(f"{key}={value}" for key, value in sorted(params.items()))
+    return f"{function}({args}) {size}MP x{channels}"
+
+
+def run_case(function, params, image, repeat):
+    """Best wall time of repeat runs, and peak traced bytes of one extra run."""
+    func = getattr(filters, function, None) or getattr(stats, function)
+    kwargs = {key: _KERNELS.get(value, value) if key == "kernel" else value for key, value in params.items()}
+
+    tracemalloc.start()
+    func(image, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(image, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, peak
+
+
+def compare(results, baseline, time_threshold, memory_threshold, min_seconds):
+    """Regression messages for cases slower or larger than the baseline allows."""
+    previous = {entry["id"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["id"])
+        if old is None:
+            continue
+        if entry["seconds"] > max(old["seconds"] * (1 + time_threshold), old["seconds"] + min_seconds):
+            regressions.append(f"{entry['id']}: {old['seconds']:.3f} s -> {entry['seconds']:.3f} s")
+        # 1 MB of slack for interpreter allocations on the small cases
+        if entry["peak_mb"] > old["peak_mb"] * (1 + memory_threshold) + 1:
+            regressions.append(f"{entry['id']}: {old['peak_mb']:.1f} MB -> {entry['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"comma-separated megapixel sizes from {list(SIZES)}")
+    parser.add_argument("--channels", default=",".join(map(str, CHANNELS)), help="comma-separated channel counts")
+    parser.add_argument("--only", default="", help="comma-separated substrings; run functions matching any")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check against")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="allowed peak memory growth")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    only = [name for name in args.only.split(",") if name]
+    functions = [name for name in CASES if not only or any(part in name for part in only)]
+    rng = np.random.default_rng(0)
+
+    results = []
+    print(f"{'case':<60} {'seconds':>9} {'MP/s':>9} {'peak MB':>9}")
+    for size in args.sizes.split(","):
+        height, width = SIZES[size]
+        for channels in map(int, args.channels.split(",")):
+            shape = (height, width) if channels == 1 else (height, width, channels)
+            image = rng.integers(0, 256, shape, dtype=np.uint8)
+            for function in functions:
+                for params in CASES[function]:
+                    seconds, peak = run_case(function, params, image, args.repeat)
+                    entry = {
+                        "id": case_id(function, params, size, channels),
+                        "function": function,
+                        "params": params,
+                        "megapixels": height * width / 1e6,
+                        "channels": channels,
+                        "seconds": seconds,
+                        "mp_per_s": height * width / 1e6 / seconds,
+                        "peak_mb": peak / 2**20,
+                    }
+                    results.append(entry)
+                    print(f"{entry['id']:<60} {seconds:>9.3f} {entry['mp_per_s']:>9.1f} {entry['peak_mb']:>9.1f}")
+            del image
+
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "precision": filters.PRECISION,
+            "repeat": args.repeat,
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold, args.min_seconds)
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Puts the repository root on sys.path, so tests import dip_studio and benchmarks as checked out."""
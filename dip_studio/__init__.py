@@ -0,0 +1,14 @@
+"""
+DIP-IMAGE-STUDIO image processing library.
+
+The filters, pipeline, cache and codecs behind the Streamlit app, usable
+without Streamlit:
+
+    from dip_studio.image_io import decode_image, encode_image
+    from dip_studio.pipeline import apply_pipeline
+
+    image = apply_pipeline(decode_image(data), [("Gaussian Blur", {"kernel_size": 7})])
+
+Directories of images can be processed from the command line with
+``python -m dip_studio.batch``.
+"""
@@ -0,0 +1,219 @@
+"""
+Headless batch processing: apply a filter or recipe to many images.
+
+    python -m dip_studio.batch photos/ -o out/ --step "Gaussian Blur:kernel_size=7"
+    python -m dip_studio.batch "scans/*.png" -o out/ --recipe recipe.json --format JPEG
+
+A recipe file is a JSON list of [filter_name, params] pairs, the same
+shape as the app's recipe. Files are spread over a process pool, one image
+per worker, with at most two images per worker in flight, so memory stays
+bounded however many files match. Each worker runs filters single-threaded;
+the parallelism is across files.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import parallel
+from .image_io import EXPORT_FORMATS, decode_image, encode_image
+from .pipeline import apply_pipeline
+from .registry import FILTERS, check_params
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+
+def find_images(inputs):
+    """Expand files, directories (non-recursive) and glob patterns into sorted image paths."""
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(path for path in matches if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path))
+    return sorted(set(paths))
+
+
+def _parse_value(text):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"parameter value '{text}' is not a number")
+
+
+def parse_step(text):
+    """Parse 'Filter Name:key=value,key=value' into a (filter_name, params) step."""
+    name, _, args = text.partition(":")
+    name = name.strip()
+    if name not in FILTERS:
+        raise argparse.ArgumentTypeError(f"unknown filter '{name}', expected one of: {', '.join(FILTERS)}")
+    params = {}
+    for item in filter(None, (arg.strip() for arg in args.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep or key.strip() not in FILTERS[name].params:
+            raise argparse.ArgumentTypeError(
+                f"bad parameter '{item}' for {name}, expected key=value with key in {list(FILTERS[name].params)}"
+            )
+        params[key.strip()] = _parse_value(value.strip())
+    try:
+        check_params(name, params)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return name, params
+
+
+def parse_recipe(entries):
+    """Validate a decoded JSON recipe, a list of [filter_name, params] pairs, into steps."""
+    if not isinstance(entries, list):
+        raise ValueError("a recipe is a list of [filter_name, params] pairs")
+    steps = []
+    for entry in entries:
+        name, params = entry if isinstance(entry, (list, tuple)) and len(entry) == 2 else (entry, None)
+        if not isinstance(name, str) or name not in FILTERS:
+            raise ValueError(f"unknown filter {name!r}")
+        params = {} if params is None else params
+        check_params(name, params)
+        steps.append((name, dict(params)))
+    return steps
+
+
+def load_recipe(path):
+    """Read a JSON recipe file into a list of (filter_name, params) steps."""
+    with open(path) as f:
+        entries = json.load(f)
+    try:
+        return parse_recipe(entries)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+
+def _init_worker():
+    """Process-pool initializer: images are the unit of parallelism, so no nested pools."""
+    parallel.PARALLEL_WORKERS = 1
+
+
+def process_image(data, steps, fmt):
+    """Decode, filter and encode one image; returns (encoded bytes, pixel count)."""
+    image = decode_image(data)
+    return encode_image(apply_pipeline(image, steps), fmt), image.shape[0] * image.shape[1]
+
+
+def process_file(path, out_path, steps, fmt):
+    """Decode, filter, encode and write one image; returns its pixel count."""
+    with open(path, "rb") as f:
+        encoded, pixels = process_image(f.read(), steps, fmt)
+    with open(out_path, "wb") as f:
+        f.write(encoded)
+    return pixels
+
+
+def output_paths(paths, out_dir, ext):
+    """Map each input path to out_dir/<stem>.<ext>, numbering stems that collide.
+
+    Inputs from different directories, or with different extensions, can
+    share a stem; in path order the first keeps it and later ones become
+    <stem>-2, <stem>-3 and so on. Names are compared case-insensitively,
+    as some file systems do.
+    """
+    taken, outputs = set(), {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, number = stem, 1
+        while f"{name}.{ext}".lower() in taken:
+            number += 1
+            name = f"{stem}-{number}"
+        taken.add(f"{name}.{ext}".lower())
+        outputs[path] = os.path.join(out_dir, f"{name}.{ext}")
+    return outputs
+
+
+def run_batch(paths, out_dir, steps, fmt="PNG", workers=None, log=sys.stderr):
+    """Process paths into out_dir, at most two files per worker in flight.
+
+    Returns (images written, failures, pixels processed, seconds).
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = output_paths(paths, out_dir, EXPORT_FORMATS[fmt][0])
+    tasks = []
+    for path in paths:
+        if os.path.splitext(os.path.basename(outputs[path]))[0] != os.path.splitext(os.path.basename(path))[0]:
+            print(f"{path}: name taken, writing {outputs[path]}", file=log)
+        tasks.append((path, outputs[path], steps, fmt))
+    done, failed, pixels = 0, 0, 0
+
+    def finish(path, pending_result):
+        nonlocal done, failed, pixels
+        try:
+            pixels += pending_result()
+            done += 1
+        except Exception as e:
+            failed += 1
+            print(f"{path}: {e}", file=log)
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker()
+        for task in tasks:
+            finish(task[0], lambda: process_file(*task))
+        return done, failed, pixels, time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = {}
+        for task in tasks:
+            if len(pending) >= 2 * workers:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    finish(pending.pop(future), future.result)
+            pending[pool.submit(process_file, *task)] = task[0]
+        for future in wait(pending).done:
+            finish(pending[future], future.result)
+    return done, failed, pixels, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m dip_studio.batch", description="Apply a filter or recipe to a batch of images."
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, directories or glob patterns")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument(
+        "--step", action="append", type=parse_step, default=[], metavar="'NAME[:key=value,...]'",
+        help="filter step, e.g. 'Gaussian Blur:kernel_size=7,sigma=2'; repeat for a recipe"
+    )
+    parser.add_argument("--recipe", help="JSON file with a list of [filter_name, params] steps, run before any --step")
+    parser.add_argument(
+        "--format", default="PNG", type=lambda name: {fmt.lower(): fmt for fmt in EXPORT_FORMATS}.get(name.lower(), name),
+        choices=list(EXPORT_FORMATS), help="output format (default PNG)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        steps = (load_recipe(args.recipe) if args.recipe else []) + args.step
+    except ValueError as e:
+        parser.error(str(e))
+    if not steps:
+        parser.error("give at least one --step or a --recipe")
+    paths = find_images(args.inputs)
+    if not paths:
+        parser.error("no images matched the inputs")
+
+    done, failed, pixels, seconds = run_batch(paths, args.output, steps, args.format, args.workers)
+    print(
+        f"{done} images ({pixels / 1e6:.1f} MP) in {seconds:.2f} s: "
+        f"{done / seconds:.2f} images/s, {pixels / 1e6 / seconds:.1f} MP/s"
+        + (f", {failed} failed" if failed else "")
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
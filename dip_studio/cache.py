@@ -0,0 +1,103 @@
+"""Content-addressed LRU cache for decoded images, results and encodings."""
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+# Decoded uploads and filter outputs keyed by content, so Streamlit reruns
+# (any widget change) and revisits of earlier filters skip the work.
+CACHE_BUDGET_BYTES = int(os.environ.get("DIP_CACHE_MB", 512)) * 1024 * 1024
+
+
+class ResultCache:
+    """Thread-safe LRU cache of NumPy arrays bounded by total bytes."""
+
+    def __init__(self, budget_bytes=CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached array (read-only) or None, updating the counters."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store an array, evicting least recently used entries over budget."""
+        value.setflags(write=False)
+        with self._lock:
+            if key in self._entries:
+                self.size_bytes -= self._entries.pop(key).nbytes
+            if value.nbytes > self.budget_bytes:
+                return value
+            self._entries[key] = value
+            self.size_bytes += value.nbytes
+            while self.size_bytes > self.budget_bytes:
+                self.size_bytes -= self._entries.popitem(last=False)[1].nbytes
+        return value
+
+    def stats(self):
+        """Counters for tuning the budget."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def content_digest(data):
+    """Content address of raw upload bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# =============================================================================
+# PER-ARRAY MEMO
+# =============================================================================
+# Planes and statistics derived from an image (luminance, histograms) are
+# remembered against the array object for as long as it lives. Only arrays
+# that own their data and are read-only qualify, i.e. cached decodes and
+# results, so the pixels cannot change underneath the memo; views and
+# scratch arrays are recomputed every time.
+_ARRAY_MEMO = {}  # (id(array), name) -> (weak reference to array, value)
+_memo_lock = threading.Lock()
+
+
+def array_memo(array, name, compute):
+    """compute(array), remembered per read-only array under name."""
+    if array.flags.writeable or not array.flags.owndata:
+        return compute(array)
+    key = (id(array), name)
+    with _memo_lock:
+        entry = _ARRAY_MEMO.get(key)
+    if entry is not None and entry[0]() is array:
+        return entry[1]
+    value = compute(array)
+
+    def forget(ref, key=key):
+        with _memo_lock:
+            if _ARRAY_MEMO.get(key, (None,))[0] is ref:
+                del _ARRAY_MEMO[key]
+
+    with _memo_lock:
+        _ARRAY_MEMO[key] = (weakref.ref(array, forget), value)
+    return value
@@ -0,0 +1,278 @@
+"""
+Frame streaming: apply a filter or recipe to animated GIF/WebP and video clips.
+
+    python -m dip_studio.frames clip.mp4 -o out.mp4 --step "Gaussian Blur:kernel_size=7"
+    python -m dip_studio.frames loop.gif -o out.gif --recipe recipe.json
+
+Frames are decoded one at a time from a generator, filtered in a thread
+pool with at most FRAME_QUEUE frames per worker in flight, and written out
+in order as soon as they are ready, so memory stays constant however long
+the clip is. Animated images go through Pillow and come out as GIF; video
+goes through OpenCV (imported on first use) and comes out as MP4.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageSequence
+
+from .image_io import cached_bytes, encode_image, pil_to_array
+from .jobs import cancellation, current_token
+from .pipeline import apply_pipeline
+
+ANIMATED_EXTENSIONS = (".gif", ".webp")
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+CLIP_FORMATS = {
+    "GIF": ("gif", "image/gif"),
+    "MP4": ("mp4", "video/mp4"),
+}
+FRAME_WORKERS = int(os.environ.get("DIP_FRAME_WORKERS", os.cpu_count() or 1))
+FRAME_QUEUE = 2  # frames per worker decoded or filtered ahead of the writer
+DEFAULT_FRAME_MS = 100  # GIF frames without a duration; browsers show them at ~10 fps
+
+
+def _cv2():
+    try:
+        import cv2
+    except ImportError:
+        raise RuntimeError("video clips need OpenCV: pip install opencv-python-headless") from None
+    return cv2
+
+
+def is_clip(data, suffix):
+    """Whether upload bytes with this file suffix hold more than one frame."""
+    suffix = suffix.lower()
+    if suffix in VIDEO_EXTENSIONS:
+        return True
+    if suffix not in ANIMATED_EXTENSIONS:
+        return False
+    with Image.open(io.BytesIO(data)) as pil_image:
+        return getattr(pil_image, "n_frames", 1) > 1
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+# iter_frames is a generator: each frame is decoded when the pool asks for
+# it, never ahead. Animated frames are composited by Pillow (disposal and
+# transparency resolved) and handed over as RGB; video frames come out of
+# OpenCV as BGR and are reordered to RGB.
+
+
+def iter_frames(path):
+    """Yield (uint8 frame, duration in ms) for each frame of an animated image or video."""
+    if path.lower().endswith(VIDEO_EXTENSIONS):
+        yield from _video_frames(path)
+        return
+    with Image.open(path) as pil_image:
+        for frame in ImageSequence.Iterator(pil_image):
+            image = pil_to_array(frame.convert("RGB"))  # WebP durations are read with the frame
+            yield image, frame.info.get("duration") or DEFAULT_FRAME_MS
+
+
+def _video_frames(path):
+    cv2 = _cv2()
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f"{path}: not a readable video")
+    duration = 1000 / (capture.get(cv2.CAP_PROP_FPS) or 25)
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), duration
+    finally:
+        capture.release()
+
+
+def first_frame(path):
+    """First frame of a clip as a uint8 array."""
+    frames = iter_frames(path)
+    try:
+        return next(frames)[0]
+    except StopIteration:
+        raise ValueError(f"{path}: clip has no frames") from None
+    finally:
+        frames.close()
+
+
+def cached_still(cache, digest, data, suffix):
+    """PNG bytes of a clip's first frame, so the single-image views can show it."""
+    key = ("still", digest)
+    cached = cache.get(key)
+    if cached is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"clip{suffix}")
+            with open(path, "wb") as f:
+                f.write(data)
+            still = encode_image(first_frame(path), "PNG")
+        cached = cache.put(key, np.frombuffer(still, dtype=np.uint8))
+    return cached_bytes(cached)
+
+
+# =============================================================================
+# FILTERING
+# =============================================================================
+# Frames are the unit of parallelism. The pool is fed from the decoder only
+# while fewer than FRAME_QUEUE * workers frames are in flight, and results
+# are yielded in submission order, so a slow frame holds back the writer
+# rather than letting finished frames pile up behind it. Workers inherit
+# the caller's cancellation token.
+
+
+def _filter_frame(frame, steps, token):
+    with cancellation(token):
+        return apply_pipeline(frame, steps)
+
+
+def filter_frames(frames, steps, workers=None):
+    """Yield (filtered frame, duration) in order, at most FRAME_QUEUE frames per worker in flight."""
+    workers = workers or FRAME_WORKERS
+    token = current_token()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dip-frame") as pool:
+        pending = deque()
+        for frame, duration in frames:
+            if len(pending) >= FRAME_QUEUE * workers:
+                future, ready_duration = pending.popleft()
+                yield future.result(), ready_duration
+            pending.append((pool.submit(_filter_frame, frame, steps, token), duration))
+        while pending:
+            future, ready_duration = pending.popleft()
+            yield future.result(), ready_duration
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+# Pillow's animated writers hold every frame until the file is closed (GIF
+# keeps them to diff consecutive frames, WebP lists them up front), so GIF
+# is written here frame by frame with Pillow's own header and frame-data
+# helpers, each frame carrying its own palette. MP4 goes through
+# cv2.VideoWriter at the first frame's rate.
+
+
+class _GifWriter:
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._started = False
+
+    def write(self, frame, duration):
+        pil_image = Image.fromarray(frame)
+        if pil_image.mode != "L":
+            pil_image = pil_image.convert("P", palette=Image.Palette.ADAPTIVE)
+        if not self._started:
+            header, _ = GifImagePlugin.getheader(pil_image, info={"loop": 0, "duration": duration})
+            self._file.write(b"".join(header))
+            self._started = True
+        for chunk in GifImagePlugin.getdata(pil_image, duration=duration, include_color_table=True):
+            self._file.write(chunk)
+
+    def close(self):
+        self._file.write(b";")  # trailer
+        self._file.close()
+
+
+class _VideoWriter:
+    def __init__(self, path):
+        self._cv2 = _cv2()
+        self._path = path
+        self._writer = None
+
+    def write(self, frame, duration):
+        cv2 = self._cv2
+        if self._writer is None:
+            height, width = frame.shape[:2]
+            self._writer = cv2.VideoWriter(
+                self._path, cv2.VideoWriter_fourcc(*"mp4v"), 1000 / duration, (width, height), frame.ndim == 3
+            )
+            if not self._writer.isOpened():
+                raise RuntimeError(f"{self._path}: OpenCV cannot write MP4 here")
+        self._writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR) if frame.ndim == 3 else frame)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+
+
+def clip_format(path):
+    """CLIP_FORMATS key matching an output path's extension."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    for fmt, (fmt_ext, _) in CLIP_FORMATS.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError(f"{path}: output must end in one of {[f'.{e}' for e, _ in CLIP_FORMATS.values()]}")
+
+
+def process_clip(path, out_path, steps, workers=None):
+    """Stream a clip through a recipe into out_path (GIF or MP4 by extension).
+
+    Returns (frames written, seconds).
+    """
+    writer = (_GifWriter if clip_format(out_path) == "GIF" else _VideoWriter)(out_path)
+    count = 0
+    start = time.perf_counter()
+    try:
+        for frame, duration in filter_frames(iter_frames(path), steps, workers):
+            writer.write(frame, duration)
+            count += 1
+    finally:
+        writer.close()
+    if not count:
+        raise ValueError(f"{path}: clip has no frames")
+    return count, time.perf_counter() - start
+
+
+def render_clip(data, suffix, steps, fmt, workers=None):
+    """Process upload bytes into encoded clip bytes; returns (bytes, frames, seconds)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"clip{suffix}")
+        out_path = os.path.join(tmp, f"out.{CLIP_FORMATS[fmt][0]}")
+        with open(path, "wb") as f:
+            f.write(data)
+        count, seconds = process_clip(path, out_path, steps, workers)
+        with open(out_path, "rb") as f:
+            return f.read(), count, seconds
+
+
+def main(argv=None):
+    from .batch import load_recipe, parse_step
+
+    parser = argparse.ArgumentParser(
+        prog="python -m dip_studio.frames", description="Apply a filter or recipe to every frame of a clip."
+    )
+    parser.add_argument("input", help="animated GIF/WebP or video (mp4, mov, avi, mkv, webm)")
+    parser.add_argument("-o", "--output", required=True, help="output file, .gif or .mp4")
+    parser.add_argument(
+        "--step", action="append", type=parse_step, default=[], metavar="'NAME[:key=value,...]'",
+        help="filter step, e.g. 'Gaussian Blur:kernel_size=7,sigma=2'; repeat for a recipe"
+    )
+    parser.add_argument("--recipe", help="JSON file with a list of [filter_name, params] steps, run before any --step")
+    parser.add_argument("--workers", type=int, default=None, help="frame worker threads (default: DIP_FRAME_WORKERS)")
+    args = parser.parse_args(argv)
+
+    try:
+        steps = (load_recipe(args.recipe) if args.recipe else []) + args.step
+    except ValueError as e:
+        parser.error(str(e))
+    if not steps:
+        parser.error("give at least one --step or a --recipe")
+    try:
+        clip_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    count, seconds = process_clip(args.input, args.output, steps, args.workers)
+    print(f"{count} frames in {seconds:.2f} s: {count / seconds:.1f} frames/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
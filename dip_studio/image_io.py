@@ -0,0 +1,216 @@
+"""Decoding uploads and encoding results for download."""
+
+import io
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from .pipeline import cache_key, cached_pipeline
+from .preview import numpy_downsample2x
+from .profiling import ENCODE_TIMINGS, profile_request, profile_stage
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+# Uploads are decoded at the smallest power-of-two reduction whose longest
+# side fits the resolution being worked at: PREVIEW_MAX_SIDE while
+# previewing, WORKING_MAX_SIDE otherwise. JPEG reductions up to 1/8 happen
+# in the decoder (DCT scaling via Image.draft), so a 24 MP photo previews
+# without ever being decoded at full size; anything further, and every
+# other format, is reduced by 2x2 averaging. Downloads always decode at
+# full resolution.
+WORKING_MAX_SIDE = int(os.environ.get("DIP_WORKING_MAX_SIDE", 4096))
+DRAFT_MAX_REDUCTION = 8
+INGEST_BLOCK_BYTES = 1024 * 1024
+INGEST_MIN_BANDS = 16  # small images are banded too, so the overhead stays a fraction of one copy
+GRAY_MODES = ("1", "L", "LA")
+# 16-bit, 32-bit integer and float grayscale, which Pillow would clip to L
+DEEP_GRAY_MODES = ("I;16", "I;16L", "I;16B", "I;16N", "I", "F")
+
+
+def image_size(data):
+    """(width, height) of encoded image bytes, read from the header only."""
+    with Image.open(io.BytesIO(data)) as pil_image:
+        return pil_image.size
+
+
+def reduction_for(size, max_side=None):
+    """Smallest power-of-two factor bringing the longest side of size within max_side."""
+    factor = 1
+    while max_side and max(size) / factor > max_side:
+        factor *= 2
+    return factor
+
+
+def pil_to_array(pil_image):
+    """Copy a Pillow image into a new uint8 array, a band of rows at a time.
+
+    np.array(pil_image) goes through tobytes(), which holds the pixels
+    twice (chunks, then the joined bytes) before NumPy copies them a third
+    time; banding keeps the peak at one array plus two bands of at most
+    INGEST_BLOCK_BYTES or 1/INGEST_MIN_BANDS of the image.
+    """
+    width, height = pil_image.size
+    channels = len(pil_image.getbands())
+    image = np.empty((height, width, channels) if channels > 1 else (height, width), dtype=np.uint8)
+    rows = max(1, min(INGEST_BLOCK_BYTES // max(1, width * channels), height // INGEST_MIN_BANDS))
+    for top in range(0, height, rows):
+        bottom = min(top + rows, height)
+        image[top:bottom] = np.asarray(pil_image.crop((0, top, width, bottom)))
+    return image
+
+
+def deep_gray_to_l(pil_image):
+    """Scale a DEEP_GRAY_MODES image linearly onto 0..255 as an L image.
+
+    16-bit data (and 32-bit integers within 0..65535) map from the full
+    16-bit range and floats within 0..1 from that range, so a dark image
+    stays dark; anything else is stretched from its own min..max.
+    """
+    if pil_image.mode.startswith("I;16"):
+        pil_image = pil_image.convert("I")
+        low, high = 0, 65535
+    else:
+        low, high = pil_image.getextrema()
+        if pil_image.mode == "I" and 0 <= low and high <= 65535:
+            low, high = 0, 65535
+        elif pil_image.mode == "F" and 0 <= low and high <= 1:
+            low, high = 0, 1
+    scale = 255 / (high - low) if high > low else 0
+    # Pillow truncates on the way to L, so offset by half a level to round
+    return pil_image.point(lambda value: value * scale + (0.5 - low * scale)).convert("L")
+
+
+def decode_image(data, reduction=1):
+    """Decode upload bytes to a uint8 array, shrunk by a power-of-two reduction.
+
+    Grayscale uploads stay 2-D; everything else becomes RGB.
+    """
+    with Image.open(io.BytesIO(data)) as pil_image:
+        width, height = pil_image.size
+        if reduction > 1:
+            # No-op for formats without decoder-level scaling
+            draft = min(reduction, DRAFT_MAX_REDUCTION)
+            pil_image.draft(None, (max(1, width // draft), max(1, height // draft)))
+        with profile_stage("decode", reduction=reduction):
+            pil_image.load()
+        
+        # Convert palette, alpha, CMYK, ... in Pillow, before anything is copied out
+        with profile_stage("normalize"):
+            if pil_image.mode in DEEP_GRAY_MODES:
+                pil_image = deep_gray_to_l(pil_image)
+            elif pil_image.mode not in ("RGB", "L"):
+                pil_image = pil_image.convert("L" if pil_image.mode in GRAY_MODES else "RGB")
+            image = pil_to_array(pil_image)
+    
+    reduction //= max(1, round(width / image.shape[1]))
+    if reduction > 1:
+        with profile_stage("downscale"):
+            while reduction > 1:
+                image = numpy_downsample2x(image)
+                reduction //= 2
+    return image
+
+
+def cached_decode(cache, digest, data, max_side=None):
+    """Decoded upload within max_side (default: full size) and its scale, cached per scale."""
+    scale = 1 / reduction_for(image_size(data), max_side)
+    key = ("decoded", digest, scale)
+    image = cache.get(key)
+    if image is None:
+        image = cache.put(key, decode_image(data, round(1 / scale)))
+    return image, scale
+
+
+# =============================================================================
+# DOWNLOAD ENCODING
+# =============================================================================
+# Format -> (file extension, MIME type, Pillow save options). Encoding runs
+# only when a download button is clicked (Streamlit calls the data callable
+# on its own thread), and the bytes are cached per (result, format, options).
+EXPORT_FORMATS = {
+    "PNG": ("png", "image/png", {}),
+    "JPEG": ("jpg", "image/jpeg", {"quality": 95}),
+    "WebP": ("webp", "image/webp", {"quality": 95}),
+}
+
+
+def encode_image(image, fmt):
+    """Encode an array with the EXPORT_FORMATS options for fmt."""
+    pil_image = Image.fromarray(image)
+    if fmt == "JPEG" and pil_image.mode not in ('RGB', 'L'):
+        pil_image = pil_image.convert('RGB')
+    buf = io.BytesIO()
+    pil_image.save(buf, format=fmt, **EXPORT_FORMATS[fmt][2])
+    return buf.getvalue()
+
+
+def cached_bytes(cached):
+    """The bytes object a cached np.frombuffer entry views, without copying it."""
+    return cached.base if isinstance(cached.base, bytes) else cached.tobytes()
+
+
+def _encoded_key(result_key, fmt):
+    return ("encoded", result_key, fmt, tuple(sorted(EXPORT_FORMATS[fmt][2].items())))
+
+
+def cached_encode(cache, result_key, image, fmt):
+    """Encoded bytes of a cached result, encoding (and timing) on a miss."""
+    key = _encoded_key(result_key, fmt)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached_bytes(cached)
+    with profile_request("download", format=fmt), profile_stage("encode"):
+        start = time.perf_counter()
+        data = encode_image(image, fmt)
+        ENCODE_TIMINGS[fmt] = (time.perf_counter() - start, len(data))
+    cache.put(key, np.frombuffer(data, dtype=np.uint8))
+    return data
+
+
+def cached_export(cache, digest, data, steps, fmt):
+    """Encoded full-resolution result of a recipe, whatever resolution the UI works at."""
+    result_key = cache_key(digest, steps)
+    cached = cache.get(_encoded_key(result_key, fmt))
+    if cached is not None:
+        return cached_bytes(cached)
+    with profile_request("download", format=fmt):
+        image, _ = cached_decode(cache, digest, data)
+        with profile_stage("filter", steps=" → ".join(name for name, _ in steps)):
+            result = cached_pipeline(cache, digest, image, steps)
+        return cached_encode(cache, result_key, result, fmt)
+
+
+# =============================================================================
+# DISPLAY ENCODING
+# =============================================================================
+# st.image turns an array into JPEG at quality 100 and, when it is wider than
+# the content area, decodes that JPEG again, resizes it and re-encodes at
+# quality 90 - on every rerun. Handing it bytes that already fit skips all
+# of that, and the bytes are cached next to the array they show.
+DISPLAY_MAX_WIDTH = 2 * 730  # st.image's content width limit
+
+
+def display_image(image, max_width=DISPLAY_MAX_WIDTH):
+    """JPEG bytes of an array as st.image would show it, resized once if too wide."""
+    pil_image = Image.fromarray(image)
+    quality = 100
+    if pil_image.width > max_width:
+        height = int(1.0 * pil_image.height * max_width / pil_image.width)
+        pil_image = pil_image.resize((max_width, height), resample=Image.BILINEAR)
+        quality = 90
+    buf = io.BytesIO()
+    pil_image.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def cached_display(cache, source_key, image):
+    """Display bytes for the array cached under source_key, encoding on a miss."""
+    key = ("display", source_key)
+    cached = cache.get(key)
+    if cached is None:
+        cached = cache.put(key, np.frombuffer(display_image(image), dtype=np.uint8))
+    return cached_bytes(cached)
@@ -0,0 +1,117 @@
+"""Background filter jobs, one live job per session, with cooperative cancellation."""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+# =============================================================================
+# COOPERATIVE CANCELLATION
+# =============================================================================
+# A job runs with a cancellation token (a threading.Event) bound to its
+# thread. Long filter loops call check_cancelled() between blocks of rows,
+# kernel taps or tiles; once the token is set it raises Cancelled, which
+# unwinds the job without caching a partial result. Outside a job the check
+# is a thread-local lookup and never raises.
+_local = threading.local()
+
+
+class Cancelled(Exception):
+    """Raised inside a job whose result is no longer wanted."""
+
+
+def current_token():
+    """Cancellation token of the job running on this thread, or None."""
+    return getattr(_local, "token", None)
+
+
+@contextmanager
+def cancellation(token):
+    """Bind token to this thread, e.g. to carry a job's token into pool workers."""
+    previous = current_token()
+    _local.token = token
+    try:
+        yield
+    finally:
+        _local.token = previous
+
+
+def check_cancelled():
+    """Raise Cancelled if the job running on this thread has been superseded."""
+    token = getattr(_local, "token", None)
+    if token is not None and token.is_set():
+        raise Cancelled()
+
+
+# =============================================================================
+# SESSION JOBS
+# =============================================================================
+# Dragging a slider reruns the app faster than a slow filter finishes. Each
+# session has at most one live job: submitting a different key sets the old
+# job's token, so it stops at its next check instead of tying up a worker,
+# and the key of the previous completed result is remembered to show it
+# meanwhile. Only keys are kept once a job finishes; jobs write their
+# results to the ResultCache, so the pixels stay within its byte budget.
+JOB_WORKERS = int(os.environ.get("DIP_JOB_WORKERS", min(4, os.cpu_count() or 1)))
+JOB_SESSIONS = 32  # sessions whose live job and last result key are remembered
+JOB_WAIT_SECONDS = 0.25  # a rerun waits this long before showing the last result instead
+
+
+class SessionJobs:
+    """Thread pool running the latest job of each session."""
+
+    def __init__(self, workers=JOB_WORKERS, max_sessions=JOB_SESSIONS):
+        self.max_sessions = max_sessions
+        self.cancelled = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dip-job")
+        self._jobs = OrderedDict()  # session -> (key, future, token) while running
+        self._completed = OrderedDict()  # session -> key
+        self._lock = threading.Lock()
+
+    def submit(self, session, key, function, *args):
+        """Future for function(*args), superseding the session's job unless it has the same key."""
+        with self._lock:
+            job = self._jobs.get(session)
+            if job is not None and job[0] == key and not job[2].is_set():
+                self._jobs.move_to_end(session)
+                return job[1]
+            if job is not None and not job[1].done():
+                job[2].set()
+                self.cancelled += 1
+            token = threading.Event()
+            future = self._pool.submit(self._run, session, key, token, function, args)
+            self._jobs[session] = (key, future, token)
+            self._jobs.move_to_end(session)
+            while len(self._jobs) > self.max_sessions:
+                self._jobs.popitem(last=False)[1][2].set()
+            return future
+
+    def cancel(self, session):
+        """Stop the session's live job, e.g. once its wanted result is already cached."""
+        with self._lock:
+            job = self._jobs.pop(session, None)
+            if job is not None and not job[1].done():
+                job[2].set()
+                self.cancelled += 1
+
+    def _run(self, session, key, token, function, args):
+        with cancellation(token):
+            check_cancelled()  # superseded while queued
+            result = function(*args)
+        with self._lock:
+            if not token.is_set():
+                # The finished future leaves the session; only its caller holds the result
+                if self._jobs.get(session, (None, None, None))[2] is token:
+                    del self._jobs[session]
+                self._completed[session] = key
+                self._completed.move_to_end(session)
+                while len(self._completed) > self.max_sessions:
+                    self._completed.popitem(last=False)
+        return result
+
+    def last_completed(self, session):
+        """Key of the session's most recent finished job, or None; its result is in the cache."""
+        with self._lock:
+            return self._completed.get(session)
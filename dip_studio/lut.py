@@ -0,0 +1,79 @@
+"""Lookup-table compilation of point-filter runs."""
+
+from functools import partial
+
+import numpy as np
+
+from .filters import numpy_grayscale, numpy_invert
+from .registry import FILTERS, filter_kwargs, filter_spec
+
+
+# =============================================================================
+# LOOKUP-TABLE POINT OPERATIONS
+# =============================================================================
+# On uint8 data brightness, contrast and invert are 256-entry mappings, and
+# threshold is one applied to the luminance plane. A run of them compiles
+# into one table per threshold segment by pushing np.arange(256) through the
+# filters themselves, so tables are bit-exact by construction and applying
+# them is a single indexed gather with no float temporaries.
+LUT_FILTERS = ("Brightness", "Contrast", "Invert", "Threshold")
+
+
+def compile_lut(steps):
+    """Compose LUT_FILTERS steps (acting on one sample) into a uint8 table."""
+    lut = np.arange(256, dtype=np.uint8)
+    for filter_name, params in steps:
+        # A 1x256 grayscale image, so Threshold sees each value as its own luminance
+        lut = FILTERS[filter_name].function(lut.reshape(1, 256), **filter_kwargs(filter_name, params)).reshape(256)
+    return lut
+
+
+def numpy_apply_lut(image, lut):
+    """Map every sample of a uint8 image through a 256-entry table."""
+    return np.take(lut, image)
+
+
+def _lut_chain(steps):
+    """Block operation for a run of LUT_FILTERS steps.
+
+    Each Threshold starts a new table applied after grayscale conversion;
+    non-uint8 input falls back to the filters themselves.
+    """
+    segments = [[]]
+    for step in steps:
+        if step[0] == "Threshold" and segments[-1]:
+            segments.append([])
+        segments[-1].append(step)
+    tables = [compile_lut(segment) for segment in segments]
+    starts_with_threshold = [segment[0][0] == "Threshold" for segment in segments]
+    
+    def run(image):
+        if image.dtype != np.uint8:
+            for filter_name, params in steps:
+                image = FILTERS[filter_name].function(image, **filter_kwargs(filter_name, params))
+            return image
+        for table, threshold in zip(tables, starts_with_threshold):
+            image = numpy_apply_lut(numpy_grayscale(image) if threshold else image, table)
+        return image
+    
+    return run
+
+
+def compile_point_steps(steps):
+    """Turn point-filter steps into block operations, merging LUT_FILTERS runs.
+
+    A lone Invert stays arithmetic: one uint8 subtraction beats a gather.
+    """
+    ops, run = [], []
+    for filter_name, params in steps + [(None, None)]:
+        if filter_name in LUT_FILTERS:
+            run.append((filter_name, params))
+            continue
+        if len(run) == 1 and run[0][0] == "Invert":
+            ops.append(numpy_invert)
+        elif run:
+            ops.append(_lut_chain(run))
+        run = []
+        if filter_name is not None:
+            ops.append(partial(filter_spec(filter_name).function, **filter_kwargs(filter_name, params)))
+    return ops
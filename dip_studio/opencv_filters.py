@@ -0,0 +1,147 @@
+"""OpenCV drop-ins for the registered NumPy filters.
+
+Each opencv_* function takes the same arguments and returns the same shape
+and dtype as its numpy_* reference in dip_studio.filters; the 'opencv'
+engine (registry.filter_spec) swaps them in. Requires opencv-python-headless.
+"""
+
+import cv2
+import numpy as np
+
+from .filters import (
+    EMBOSS_KERNEL, SEPIA_MATRIX, _float_dtype, _normalize_peak, _row_blocks, gaussian_kernel,
+    numpy_grayscale, separate_kernel, sharpen_kernel,
+)
+
+
+# =============================================================================
+# OPENCV FILTERS
+# =============================================================================
+# Borders use cv2.BORDER_REFLECT_101, OpenCV's name for np.pad(mode='reflect'):
+# the edge pixel is mirrored, not repeated (BORDER_REFLECT would match
+# np.pad's 'symmetric' instead). medianBlur always replicates its border, so
+# the median pads explicitly first. Kernels accumulate in the precision
+# mode's float dtype (float32 for 'fixed') and are clipped and truncated to
+# uint8 as the references do, rather than rounded as OpenCV would, so the
+# default float64 matches the references; float32 agrees to within one
+# grey level where a sum lands on the other side of an integer (also
+# between tiles, as OpenCV rounds the last columns of a row differently).
+# Integer work (Sobel and Laplacian derivatives, median, threshold) is exact.
+# Luminance always comes from numpy_grayscale: cv2.cvtColor rounds where
+# the reference floors, and the memoized plane is shared either way.
+# OpenCV calls cannot be interrupted; cancellation still stops tiled and
+# band-parallel runs between pieces.
+BORDER = cv2.BORDER_REFLECT_101
+
+
+def _depth(precision=None):
+    return cv2.CV_64F if _float_dtype(precision) == np.float64 else cv2.CV_32F
+
+
+def _to_uint8(result):
+    return np.clip(result, 0, 255, out=result).astype(np.uint8)
+
+
+def opencv_correlate(image, kernel, precision=None):
+    """Unclipped 2D correlation with reflect borders; separable kernels run as two 1-D passes."""
+    vectors = separate_kernel(kernel)
+    if vectors is not None:
+        column, row = vectors
+        return cv2.sepFilter2D(image, _depth(precision), row, column, borderType=BORDER)
+    return cv2.filter2D(image, _depth(precision), kernel, borderType=BORDER)
+
+
+def opencv_gaussian_blur(image, kernel_size=5, sigma=1.0, precision=None):
+    """Gaussian blur with the reference kernel. Peak memory: ~1 + B bytes per sample."""
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    return _to_uint8(opencv_correlate(image, gaussian_kernel(kernel_size, sigma), precision))
+
+
+def opencv_box_blur(image, kernel_size=5, precision=None):
+    """Box blur. Peak memory: ~1 + B bytes per sample."""
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    size = (kernel_size, kernel_size)
+    return _to_uint8(cv2.boxFilter(image, _depth(precision), size, borderType=BORDER))
+
+
+def opencv_sharpen(image, strength=1.0, precision=None):
+    """Sharpening filter. Peak memory: ~1 + B bytes per sample."""
+    return _to_uint8(opencv_correlate(image, sharpen_kernel(strength), precision))
+
+
+def opencv_emboss(image, precision=None):
+    """Emboss effect. Peak memory: ~1 + B bytes per sample."""
+    result = _to_uint8(opencv_correlate(image, EMBOSS_KERNEL, precision))
+    return np.clip(result + 128, 0, 255).astype(np.uint8)
+
+
+def opencv_median_filter(image, kernel_size=3):
+    """Median filter over reflect-padded windows.
+
+    Peak memory: ~2 bytes per sample (padded copy and output).
+    """
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    pad = kernel_size // 2
+    height, width = image.shape[:2]
+    padded = cv2.copyMakeBorder(image, pad, pad, pad, pad, BORDER)
+    return np.ascontiguousarray(cv2.medianBlur(padded, kernel_size)[pad:pad + height, pad:pad + width])
+
+
+def _opencv_sobel_magnitude(image, precision=None):
+    """Un-normalized Sobel gradient magnitude."""
+    gray = numpy_grayscale(image)
+    gx = cv2.Sobel(gray, _depth(precision), 1, 0, ksize=3, borderType=BORDER)
+    gy = cv2.Sobel(gray, _depth(precision), 0, 1, ksize=3, borderType=BORDER)
+    return cv2.magnitude(gx, gy)
+
+
+def opencv_sobel_edge(image, precision=None):
+    """Sobel edge detection. Peak memory: ~1 + 3B bytes per pixel."""
+    return _normalize_peak(_opencv_sobel_magnitude(image, precision), precision)
+
+
+def _opencv_laplacian_response(image, precision=None):
+    """Un-normalized absolute int16 Laplacian response."""
+    laplacian = cv2.Laplacian(numpy_grayscale(image), cv2.CV_16S, ksize=1, borderType=BORDER)
+    return np.abs(laplacian, out=laplacian)
+
+
+def opencv_laplacian(image, precision=None):
+    """Laplacian edge detection. Peak memory: ~2 bytes per pixel, plus B while normalizing."""
+    return _normalize_peak(_opencv_laplacian_response(image), precision)
+
+
+def opencv_threshold(image, threshold_value=128):
+    """Binary thresholding of the luminance plane. Peak memory: 1 byte per pixel."""
+    return cv2.threshold(numpy_grayscale(image), threshold_value, 255, cv2.THRESH_BINARY)[1]
+
+
+def opencv_sepia(image):
+    """Sepia tone filter, float64 per block of rows as the reference.
+
+    Peak memory: 1 byte per sample + POINT_BLOCK_BYTES.
+    """
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    result = np.empty(image.shape[:2] + (3,), dtype=np.uint8)
+    for rows in _row_blocks(image):
+        result[rows] = _to_uint8(cv2.transform(image[rows].astype(np.float64), SEPIA_MATRIX))
+    return result
+
+
+# UI name -> (function, response), the registry fields the engine replaces.
+# Filters missing here keep their NumPy reference under every engine.
+OPENCV_FILTERS = {
+    "Threshold": (opencv_threshold, None),
+    "Sharpen": (opencv_sharpen, None),
+    "Gaussian Blur": (opencv_gaussian_blur, None),
+    "Box Blur": (opencv_box_blur, None),
+    "Median Filter": (opencv_median_filter, None),
+    "Sobel": (opencv_sobel_edge, _opencv_sobel_magnitude),
+    "Laplacian": (opencv_laplacian, _opencv_laplacian_response),
+    "Sepia": (opencv_sepia, None),
+    "Emboss": (opencv_emboss, None),
+}
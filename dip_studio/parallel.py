@@ -0,0 +1,166 @@
+"""Band-parallel execution of registered filters."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .filters import _normalize_peak
+from . import registry
+from .jobs import cancellation, current_token
+from .registry import filter_kwargs, filter_spec
+from .tiling import iter_tiles, numpy_tiled_filter
+
+
+# =============================================================================
+# PARALLEL EXECUTION
+# =============================================================================
+# The image is cut into one horizontal band per worker, each overlapping its
+# neighbours by the kernel radius, exactly like the tiled engine. Given a
+# tile_size, the workers take tiles instead, so the working memory of each
+# call stays bounded on images too large to filter in a few bands.
+# Thread workers share the image directly; process workers attach to the
+# input and output through shared memory so no pixels are pickled.
+PARALLEL_WORKERS = int(os.environ.get("DIP_WORKERS", os.cpu_count() or 1))
+PARALLEL_MIN_PIXELS = 1024 * 1024  # below this, pool overhead outweighs the gain
+_EXECUTORS = {}
+
+
+def _get_executor(kind, workers):
+    """Reuse one pool per (kind, workers) across calls."""
+    key = (kind, workers)
+    if key not in _EXECUTORS:
+        pool = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+        _EXECUTORS[key] = pool(max_workers=workers)
+    return _EXECUTORS[key]
+
+
+def _output_layout(function, image, kwargs, halo):
+    """Output (shape, dtype) of a filter, probed on a small corner crop."""
+    corner = 2 * halo + 2
+    probe = function(np.asarray(image[:corner, :corner]), **kwargs)
+    return image.shape[:2] + probe.shape[2:], probe.dtype
+
+
+def _filter_band(function, image, kwargs, band, token=None):
+    source, target, crop = band
+    with cancellation(token):
+        return function(image[source], **kwargs)[crop]
+
+
+class _SharedFlag:
+    """Cancellation token of a process worker: the byte after the shared input image."""
+
+    def __init__(self, buf, offset):
+        self.buf = buf
+        self.offset = offset
+
+    def is_set(self):
+        return self.buf[self.offset] != 0
+
+
+def _process_band(task):
+    """Process-pool worker: filter one band between shared-memory buffers."""
+    filter_name, engine, kwargs, in_spec, out_spec, band = task
+    in_shm = shared_memory.SharedMemory(name=in_spec[0])
+    out_shm = shared_memory.SharedMemory(name=out_spec[0])
+    try:
+        image = np.ndarray(in_spec[1], dtype=in_spec[2], buffer=in_shm.buf)
+        out = np.ndarray(out_spec[1], dtype=out_spec[2], buffer=out_shm.buf)
+        token = _SharedFlag(in_shm.buf, image.nbytes)
+        out[band[1]] = _filter_band(filter_spec(filter_name, engine).function, image, kwargs, band, token)
+        del image, out, token
+    finally:
+        in_shm.close()
+        out_shm.close()
+
+
+def _run_process_bands(image, filter_name, engine, kwargs, bands, out_shape, out_dtype, workers):
+    """Copy the image into shared memory and let a process pool fill the output.
+
+    If the calling job is cancelled, the flag byte after the input tells the
+    bands to stop at their next check.
+    """
+    out_size = int(np.prod(out_shape)) * np.dtype(out_dtype).itemsize
+    in_shm = shared_memory.SharedMemory(create=True, size=image.nbytes + 1)
+    out_shm = shared_memory.SharedMemory(create=True, size=max(out_size, 1))
+    try:
+        np.ndarray(image.shape, dtype=image.dtype, buffer=in_shm.buf)[...] = image
+        in_shm.buf[image.nbytes] = 0
+        in_spec = (in_shm.name, image.shape, image.dtype.str)
+        out_spec = (out_shm.name, out_shape, np.dtype(out_dtype).str)
+        pool = _get_executor("process", workers)
+        futures = [pool.submit(_process_band, (filter_name, engine, kwargs, in_spec, out_spec, band)) for band in bands]
+        token, pending = current_token(), futures
+        while pending:
+            pending = wait(pending, timeout=0.05).not_done
+            if token is not None and token.is_set():
+                in_shm.buf[image.nbytes] = 1
+        for future in futures:
+            future.result()  # re-raises band errors, or Cancelled
+        return np.ndarray(out_shape, dtype=out_dtype, buffer=out_shm.buf).copy()
+    finally:
+        in_shm.close()
+        in_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+
+def numpy_parallel_filter(image, filter_name, params=None, workers=None, executor=None, tile_size=None):
+    """Apply a registered filter on overlapping horizontal bands in a worker pool.
+
+    workers defaults to PARALLEL_WORKERS; executor ('thread' or 'process')
+    defaults to the filter's registry hint. With tile_size, the pieces are
+    tiles of that size rather than one band per worker. Output is
+    bit-identical to a single whole-image call.
+    """
+    engine = registry.ENGINE
+    spec = filter_spec(filter_name, engine)
+    kwargs = filter_kwargs(filter_name, params)
+    halo = spec.halo(kwargs)
+    workers = workers or PARALLEL_WORKERS
+    executor = executor or spec.executor
+    if tile_size is not None:
+        if workers == 1:
+            return numpy_tiled_filter(image, filter_name, params, tile_size)
+        bands = list(iter_tiles(image.shape, tile_size, halo))
+    else:
+        band_rows = max(-(-image.shape[0] // workers), halo + 1)
+        bands = list(iter_tiles(image.shape, (band_rows, image.shape[1]), halo))
+    
+    if workers == 1 or len(bands) == 1:
+        return spec.function(image, **kwargs)
+    
+    # Thread workers inherit the caller's cancellation token
+    token = current_token()
+    if spec.response is not None:
+        # Peak-normalized: gather raw responses, then scale by the global peak.
+        # Tiles are not kept; like the tiled engine, they are filtered twice.
+        pool = _get_executor("thread", workers)
+        out = np.empty(image.shape[:2], dtype=np.uint8)
+        if tile_size is not None:
+            peak = max(pool.map(lambda band: _filter_band(spec.response, image, kwargs, band, token).max(), bands))
+            
+            def normalize(band):
+                out[band[1]] = _normalize_peak(_filter_band(spec.response, image, kwargs, band, token), peak=peak)
+            
+            list(pool.map(normalize, bands))
+            return out
+        responses = list(pool.map(lambda band: _filter_band(spec.response, image, kwargs, band, token), bands))
+        peak = max(response.max() for response in responses)
+        for (source, target, crop), response in zip(bands, responses):
+            out[target] = _normalize_peak(response, peak=peak)
+        return out
+    
+    out_shape, out_dtype = _output_layout(spec.function, image, kwargs, halo)
+    if executor == "process":
+        return _run_process_bands(image, filter_name, engine, kwargs, bands, out_shape, out_dtype, workers)
+    
+    out = np.empty(out_shape, dtype=out_dtype)
+    
+    def run(band):
+        out[band[1]] = _filter_band(spec.function, image, kwargs, band, token)
+    
+    list(_get_executor("thread", workers).map(run, bands))
+    return out
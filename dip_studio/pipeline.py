@@ -0,0 +1,118 @@
+"""Running filters and recipes, with or without the result cache."""
+
+import numpy as np
+
+from . import parallel, registry
+from .filters import _row_blocks, numpy_grayscale
+from .lut import compile_point_steps
+from .preview import scale_params
+from .registry import LUMINANCE_FILTERS, filter_kwargs, filter_spec, is_global_filter, is_point_filter
+from .tiling import TILE_SIZE, TILED_MIN_PIXELS, numpy_tiled_filter
+
+
+# =============================================================================
+# FILTER PIPELINE
+# =============================================================================
+# A recipe is an ordered list of (filter_name, params) steps. Runs of
+# adjacent point filters (no halo: brightness, contrast, invert, threshold,
+# grayscale, sepia) are fused so the image is traversed once for the whole
+# run. The result after every group is cached under its prefix of the
+# recipe, so editing step N only recomputes from the group holding step N.
+
+
+def apply_filter(filter_name, image, params=None):
+    """Run a registered filter across workers, tile by tile for very large images.
+
+    Luminance-only filters start from the image's shared grayscale plane.
+    """
+    if filter_name in LUMINANCE_FILTERS:
+        image = numpy_grayscale(image)
+    if is_global_filter(filter_name):
+        return filter_spec(filter_name).function(image, **filter_kwargs(filter_name, params))
+    pixels = image.shape[0] * image.shape[1]
+    if parallel.PARALLEL_WORKERS > 1 and pixels >= parallel.PARALLEL_MIN_PIXELS:
+        # Over TILED_MIN_PIXELS the workers take tiles, keeping memory bounded
+        tile_size = TILE_SIZE if pixels > TILED_MIN_PIXELS else None
+        return parallel.numpy_parallel_filter(image, filter_name, params, tile_size=tile_size)
+    if pixels > TILED_MIN_PIXELS:
+        return numpy_tiled_filter(image, filter_name, params)
+    return filter_spec(filter_name).function(image, **filter_kwargs(filter_name, params))
+
+
+def step_key(filter_name, params=None, scale=1.0):
+    """Hashable form of one step; params are scaled and normalized to the filter's kwargs."""
+    kwargs = filter_kwargs(filter_name, scale_params(filter_name, params, scale))
+    return (filter_name, tuple(sorted(kwargs.items())))
+
+
+def cache_key(digest, steps, scale=1.0):
+    """Key for the result of a chain of (filter_name, params) steps under the current engine."""
+    return ("result", digest, scale, tuple(step_key(name, params, scale) for name, params in steps), registry.ENGINE)
+
+
+def fuse_steps(steps):
+    """Group consecutive point-filter steps; every other step is its own group."""
+    groups = []
+    for step in steps:
+        if groups and is_point_filter(step[0]) and is_point_filter(groups[-1][-1][0]):
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def apply_fused(image, steps):
+    """Run point-filter steps block by block, keeping each block hot between steps.
+
+    Runs of lookup-table filters are compiled into tables once, up front.
+    A run that starts from luminance works on the image's shared plane.
+    """
+    if steps[0][0] in LUMINANCE_FILTERS:
+        image = numpy_grayscale(image)
+    ops = compile_point_steps(steps)
+    out = None
+    for rows in _row_blocks(image):
+        block = image[rows]
+        for op in ops:
+            block = op(block)
+        if out is None:
+            out = np.empty(image.shape[:2] + block.shape[2:], dtype=block.dtype)
+        out[rows] = block
+    return out
+
+
+def apply_pipeline(image, steps):
+    """Apply a recipe without caching."""
+    for group in fuse_steps(steps):
+        image = apply_fused(image, group) if is_point_filter(group[0][0]) else apply_filter(group[0][0], image, group[0][1])
+    return image
+
+
+def cached_pipeline(cache, digest, image, steps, scale=1.0):
+    """Apply a recipe, resuming from the longest cached prefix.
+
+    image is the pyramid level at scale; spatial params are scaled to match.
+    """
+    groups = fuse_steps(steps)
+    ends = np.cumsum([len(group) for group in groups])
+    keys = [cache_key(digest, steps[:end], scale) for end in ends]
+    
+    start, result = 0, image
+    for index in range(len(groups) - 1, -1, -1):
+        cached = cache.get(keys[index])
+        if cached is not None:
+            start, result = index + 1, cached
+            break
+    
+    for index in range(start, len(groups)):
+        group = [(name, scale_params(name, params, scale)) for name, params in groups[index]]
+        result = cache.put(keys[index], apply_pipeline(result, group))
+    return result
+
+
+def cached_filter(cache, digest, filter_name, image, params=None, scale=1.0):
+    """Filter result from the cache, computing it on a miss.
+
+    image is the pyramid level at scale; spatial params are scaled to match.
+    """
+    return cached_pipeline(cache, digest, image, [(filter_name, params)], scale)
@@ -0,0 +1,45 @@
+"""Downscaled pyramid levels for interactive previews."""
+
+import numpy as np
+
+from .registry import FILTERS
+
+
+# =============================================================================
+# PROGRESSIVE PREVIEW
+# =============================================================================
+# While sliders move, filters run on a pyramid level whose longest side is at
+# most PREVIEW_MAX_SIDE, with kernel sizes scaled to cover the same area of
+# the scene. Levels are decoded by image_io.cached_decode (JPEG uploads are
+# reduced in the decoder); the full-resolution result is only computed on
+# request.
+PREVIEW_MAX_SIDE = 640
+SPATIAL_PARAMS = ("kernel_size", "sigma")
+
+
+def numpy_downsample2x(image):
+    """Halve both dimensions by averaging 2x2 blocks (a trailing odd row/column is dropped)."""
+    h, w = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    total = image[0:h:2, 0:w:2].astype(np.uint16)
+    total += image[1:h:2, 0:w:2]
+    total += image[0:h:2, 1:w:2]
+    total += image[1:h:2, 1:w:2]
+    total += 2
+    total //= 4
+    return total.astype(np.uint8)
+
+
+def scale_params(filter_name, params, scale):
+    """UI params with spatial ones (kernel size, sigma) scaled for a pyramid level."""
+    params = dict(params or {})
+    if scale == 1.0:
+        return params
+    for key, (arg, default) in FILTERS[filter_name].params.items():
+        if key in SPATIAL_PARAMS:
+            params.setdefault(key, default)
+    if "kernel_size" in params:
+        params["kernel_size"] = max(1, int(round(params["kernel_size"] * scale)))
+    if "sigma" in params:
+        params["sigma"] = params["sigma"] * scale
+    return params
+
@@ -0,0 +1,93 @@
+"""Per-stage timing and memory instrumentation, off unless DIP_PROFILE is set."""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+
+# =============================================================================
+# STAGE PROFILING
+# =============================================================================
+# A request (one app rerun, one background filter job, one download encode)
+# collects the stages that run on its thread: decode, normalize, downscale,
+# filter, display, encode. A rerun only times its wait for the filter job,
+# which is recorded as a request of its own on the job thread. Each
+# stage records wall time and the peak bytes allocated above what was live
+# when it started, via tracemalloc. Tracing slows allocation-heavy code and
+# is process-wide, so concurrent sessions inflate each other's peaks; it is
+# only switched on with DIP_PROFILE=1. Finished requests are kept in
+# RECENT_TRACES, logged as JSON on the "dip_studio.profile" logger and, if
+# DIP_PROFILE_LOG names a file, appended to it as JSON lines.
+PROFILE = os.environ.get("DIP_PROFILE", "") not in ("", "0")
+PROFILE_LOG = os.environ.get("DIP_PROFILE_LOG")
+RECENT_TRACES = deque(maxlen=100)
+ENCODE_TIMINGS = {}  # format -> (seconds, bytes) of the last encode, for the stats panel
+
+logger = logging.getLogger("dip_studio.profile")
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+@contextmanager
+def profile_request(name, **fields):
+    """Collect the stages run on this thread into one trace dict (None when off).
+
+    Nested requests fold into the outer one.
+    """
+    if not PROFILE or getattr(_local, "trace", None) is not None:
+        yield getattr(_local, "trace", None)
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    trace = {"request": name, "timestamp": time.time(), **fields, "stages": []}
+    _local.trace = trace
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        _local.trace = None
+        trace["seconds"] = time.perf_counter() - start
+        _record(trace)
+
+
+@contextmanager
+def profile_stage(name, **fields):
+    """Time one stage of the current request; a no-op outside profile_request."""
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        yield
+        return
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        trace["stages"].append({
+            "stage": name,
+            "seconds": seconds,
+            "peak_bytes": peak - base,
+            "net_bytes": current - base,
+            **fields,
+        })
+
+
+def traces_jsonl(traces=None):
+    """Finished traces (default: RECENT_TRACES) as JSON lines."""
+    return "".join(json.dumps(trace) + "\n" for trace in (RECENT_TRACES if traces is None else traces))
+
+
+def _record(trace):
+    RECENT_TRACES.append(trace)
+    line = json.dumps(trace)
+    logger.info(line)
+    if PROFILE_LOG:
+        with _log_lock, open(PROFILE_LOG, "a") as f:
+            f.write(line + "\n")
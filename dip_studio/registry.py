@@ -0,0 +1,154 @@
+"""Filter registry: UI names, parameters and execution hints."""
+
+import math
+import os
+from collections import namedtuple
+
+from .filters import (
+    _laplacian_response, _sobel_magnitude, _thin_edge_response, numpy_box_blur, numpy_brightness,
+    numpy_contrast, numpy_emboss, numpy_gaussian_blur, numpy_grayscale, numpy_invert, numpy_laplacian,
+    numpy_median_filter, numpy_sepia, numpy_sharpen, numpy_sobel_edge, numpy_thin_edges, numpy_threshold,
+)
+from .stats import numpy_auto_levels, numpy_auto_threshold
+
+
+# =============================================================================
+# FILTER REGISTRY
+# =============================================================================
+# UI name -> FilterSpec.
+#   params:   UI parameter name -> (keyword argument, default)
+#   halo:     kernel radius a tile needs from its neighbours, given the kwargs
+#   response: for filters scaled by a global peak (Sobel, Laplacian), the
+#             un-normalized output, so tiles can share one peak
+#   executor: 'thread' when the work is in GIL-releasing NumPy loops,
+#             'process' when Python-level overhead dominates (median),
+#             None when the output depends on whole-image statistics
+#             (auto levels, Otsu), so the filter always runs in one piece
+FilterSpec = namedtuple("FilterSpec", ["function", "params", "halo", "response", "executor"])
+
+
+def _no_halo(kwargs):
+    return 0
+
+
+def _unit_halo(kwargs):
+    return 1
+
+
+def _nms_halo(kwargs):
+    # Gradients need one pixel, non-maximum suppression one more
+    return 2
+
+
+def _kernel_halo(kwargs):
+    return kwargs["kernel_size"] // 2
+
+
+FILTERS = {
+    "Grayscale": FilterSpec(numpy_grayscale, {}, _no_halo, None, "thread"),
+    "Invert": FilterSpec(numpy_invert, {}, _no_halo, None, "thread"),
+    "Threshold": FilterSpec(numpy_threshold, {"threshold": ("threshold_value", 128)}, _no_halo, None, "thread"),
+    "Auto Threshold": FilterSpec(numpy_auto_threshold, {}, _no_halo, None, None),
+    "Brightness": FilterSpec(numpy_brightness, {"value": ("value", 0)}, _no_halo, None, "thread"),
+    "Contrast": FilterSpec(numpy_contrast, {"factor": ("factor", 1.0)}, _no_halo, None, "thread"),
+    "Auto Levels": FilterSpec(numpy_auto_levels, {"clip": ("clip_percent", 0.5)}, _no_halo, None, None),
+    "Sharpen": FilterSpec(numpy_sharpen, {"strength": ("strength", 1.0)}, _unit_halo, None, "thread"),
+    "Gaussian Blur": FilterSpec(numpy_gaussian_blur, {"kernel_size": ("kernel_size", 5), "sigma": ("sigma", 1.0)}, _kernel_halo, None, "thread"),
+    "Box Blur": FilterSpec(numpy_box_blur, {"kernel_size": ("kernel_size", 5)}, _kernel_halo, None, "thread"),
+    "Median Filter": FilterSpec(numpy_median_filter, {"kernel_size": ("kernel_size", 3)}, _kernel_halo, None, "process"),
+    "Sobel": FilterSpec(numpy_sobel_edge, {}, _unit_halo, _sobel_magnitude, "thread"),
+    "Laplacian": FilterSpec(numpy_laplacian, {}, _unit_halo, _laplacian_response, "thread"),
+    "Thin Edges": FilterSpec(numpy_thin_edges, {}, _nms_halo, _thin_edge_response, "thread"),
+    "Sepia": FilterSpec(numpy_sepia, {}, _no_halo, None, "thread"),
+    "Emboss": FilterSpec(numpy_emboss, {}, _unit_halo, None, "thread"),
+}
+
+
+# Filters that convert to luminance first and never look at colour again; on
+# a 2-D plane the conversion is a no-op, so callers can hand them the shared,
+# memoized plane (numpy_grayscale of a cached image) instead.
+LUMINANCE_FILTERS = ("Grayscale", "Threshold", "Auto Threshold", "Sobel", "Laplacian", "Thin Edges")
+
+
+def filter_kwargs(filter_name, params=None):
+    """Map UI parameters onto the filter's keyword arguments, filling defaults."""
+    params = params or {}
+    return {arg: params.get(key, default) for key, (arg, default) in FILTERS[filter_name].params.items()}
+
+
+MAX_KERNEL_SIZE = 31  # twice the UI slider's range; kernel cost grows with its square
+MAX_SIGMA = 10.0
+
+
+def check_params(filter_name, params):
+    """Raise ValueError unless params are known, finite numbers in range for the filter.
+
+    Kernel sizes must be odd integers from 1 to MAX_KERNEL_SIZE and sigma
+    in (0, MAX_SIGMA]; the UI's sliders cannot produce anything else, the
+    batch CLI and service can.
+    """
+    if not isinstance(params, dict):
+        raise ValueError(f"parameters for {filter_name} must be an object of name: number, not {params!r}")
+    expected = FILTERS[filter_name].params
+    unknown = set(params) - set(expected)
+    if unknown:
+        raise ValueError(f"unknown parameters {sorted(unknown)} for {filter_name}, expected some of {list(expected)}")
+    for key, value in params.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{filter_name} parameter '{key}' must be a finite number, not {value!r}")
+    kernel_size = params.get("kernel_size")
+    if kernel_size is not None and (
+        not isinstance(kernel_size, int) or not 1 <= kernel_size <= MAX_KERNEL_SIZE or kernel_size % 2 == 0
+    ):
+        raise ValueError(f"{filter_name} kernel_size must be an odd integer from 1 to {MAX_KERNEL_SIZE}, not {kernel_size!r}")
+    if not 0 < params.get("sigma", 1.0) <= MAX_SIGMA:
+        raise ValueError(f"{filter_name} sigma must be above 0 and at most {MAX_SIGMA:g}, not {params['sigma']!r}")
+
+
+def is_point_filter(filter_name):
+    """True for filters whose output pixel depends only on the same input pixel."""
+    spec = FILTERS[filter_name]
+    return spec.halo is _no_halo and spec.response is None and spec.executor is not None
+
+
+def is_global_filter(filter_name):
+    """True for filters driven by whole-image statistics, which cannot be split into tiles."""
+    return FILTERS[filter_name].executor is None
+
+
+# =============================================================================
+# ENGINES
+# =============================================================================
+# 'numpy' runs the from-scratch filters above, the reference. 'opencv' swaps
+# in the drop-ins of dip_studio.opencv_filters for the filters that have
+# one (blurs, median, sharpen, Sobel, Laplacian, emboss, sepia, threshold)
+# and keeps the reference for the rest. Halo and parameters are shared, so
+# tiling, bands and caching work the same under both; OpenCV releases the
+# GIL, so its drop-ins (median included) run on thread bands. Set
+# DIP_ENGINE in the environment, assign ENGINE, or pass engine= here.
+ENGINES = ("numpy", "opencv")
+ENGINE = os.environ.get("DIP_ENGINE", "numpy")
+_ENGINE_FILTERS = {}
+
+
+def filter_spec(filter_name, engine=None):
+    """FilterSpec of filter_name under an engine (default ENGINE)."""
+    engine = ENGINE if engine is None else engine
+    if engine == "numpy":
+        return FILTERS[filter_name]
+    return _engine_filters(engine).get(filter_name, FILTERS[filter_name])
+
+
+def _engine_filters(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+    if engine not in _ENGINE_FILTERS:
+        try:
+            from .opencv_filters import OPENCV_FILTERS
+        except ImportError:
+            raise RuntimeError("the 'opencv' engine needs OpenCV: pip install opencv-python-headless") from None
+        _ENGINE_FILTERS[engine] = {
+            name: FILTERS[name]._replace(function=function, response=response, executor="thread")
+            for name, (function, response) in OPENCV_FILTERS.items()
+        }
+    return _ENGINE_FILTERS[engine]
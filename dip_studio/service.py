@@ -0,0 +1,241 @@
+"""
+Local HTTP processing service for the filters and recipes.
+
+    python -m dip_studio.service [--host 127.0.0.1] [--port 8502] [--workers N] [--queue-depth M]
+    uvicorn dip_studio.service:app          # configured by DIP_SERVICE_* variables
+
+Endpoints:
+    GET  /health           pool size, jobs in flight and capacity
+    GET  /filters          registered filters and their parameters
+    POST /filters/{name}   one filter; parameters and ?format= in the query string
+    POST /process          a recipe, given as ?recipe=<JSON> or a multipart "recipe" field
+    POST /batch            every multipart file through one recipe; returns a ZIP
+
+Images are the raw request body or multipart file fields; recipes use the
+batch CLI's JSON shape, a list of [filter_name, params] pairs. Jobs run on
+a process pool. At most workers + queue depth jobs are admitted at once;
+beyond that requests get 503 with Retry-After instead of queueing
+unbounded work. A batch is admitted while a slot is free and then feeds
+its images through the same slots as they free up.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from PIL import UnidentifiedImageError
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from .batch import _init_worker, _parse_value, parse_recipe, process_image
+from .image_io import EXPORT_FORMATS
+from .registry import FILTERS, check_params
+
+SERVICE_WORKERS = int(os.environ.get("DIP_SERVICE_WORKERS", os.cpu_count() or 1))
+SERVICE_QUEUE_DEPTH = int(os.environ.get("DIP_SERVICE_QUEUE", 2 * SERVICE_WORKERS))
+MAX_IMAGE_BYTES = 64 * 1024 * 1024
+MAX_BATCH_IMAGES = 256
+_FORMATS = {fmt.lower(): fmt for fmt in EXPORT_FORMATS}
+
+
+def _bad_request(message):
+    return HTTPException(400, message)
+
+
+def _output_format(value):
+    fmt = _FORMATS.get((value or "png").lower())
+    if fmt is None:
+        raise _bad_request(f"unknown format '{value}', expected one of {list(EXPORT_FORMATS)}")
+    return fmt
+
+
+def _query_step(name, query):
+    """(filter_name, params) from a path name and query-string parameters."""
+    if name not in FILTERS:
+        raise HTTPException(404, f"unknown filter '{name}', expected one of: {', '.join(FILTERS)}")
+    params = {}
+    for key, value in query.items():
+        if key == "format":
+            continue
+        if key not in FILTERS[name].params:
+            raise _bad_request(f"unknown parameter '{key}' for {name}, expected some of {list(FILTERS[name].params)}")
+        try:
+            params[key] = _parse_value(value)
+        except argparse.ArgumentTypeError as e:
+            raise _bad_request(str(e))
+    try:
+        check_params(name, params)
+    except ValueError as e:
+        raise _bad_request(str(e))
+    return name, params
+
+
+def _recipe(text):
+    if not text:
+        raise _bad_request("missing recipe: a JSON list of [filter_name, params] pairs")
+    try:
+        return parse_recipe(json.loads(text))
+    except ValueError as e:  # includes JSONDecodeError
+        raise _bad_request(f"bad recipe: {e}")
+
+
+async def _read_request(request):
+    """(list of (name, image bytes), form fields) from a raw or multipart body."""
+    length = int(request.headers.get("content-length") or 0)
+    if length > MAX_IMAGE_BYTES * MAX_BATCH_IMAGES:
+        raise HTTPException(413, "request body too large")
+
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form(max_files=MAX_BATCH_IMAGES)
+        images, fields = [], {}
+        for key, value in form.multi_items():
+            if isinstance(value, UploadFile):
+                images.append((value.filename or key, await value.read()))
+            else:
+                fields[key] = value
+        await form.close()
+    else:
+        body = await request.body()
+        images, fields = ([("image", body)] if body else []), {}
+
+    if not images:
+        raise _bad_request("no image in the request body")
+    for name, data in images:
+        if len(data) > MAX_IMAGE_BYTES:
+            raise HTTPException(413, f"{name}: image larger than {MAX_IMAGE_BYTES // 2**20} MB")
+    return images, fields
+
+
+def create_app(workers=None, queue_depth=None):
+    """ASGI app with its own process pool of workers and admission limit."""
+    workers = workers or SERVICE_WORKERS
+    capacity = workers + (SERVICE_QUEUE_DEPTH if queue_depth is None else queue_depth)
+    slots = asyncio.Semaphore(capacity)
+    state = {"pool": None, "in_flight": 0, "rejected": 0}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        state["pool"] = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        try:
+            yield
+        finally:
+            state["pool"].shutdown(cancel_futures=True)
+
+    def admit():
+        """Reject the request now rather than queue it behind a full pool."""
+        if slots.locked():
+            state["rejected"] += 1
+            raise HTTPException(503, "all workers busy and queue full", headers={"Retry-After": "1"})
+
+    async def run_job(data, steps, fmt):
+        """Encoded result of one image, run on the pool once a slot is free."""
+        async with slots:
+            state["in_flight"] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(state["pool"], process_image, data, steps, fmt)
+            finally:
+                state["in_flight"] -= 1
+
+    async def run_single(data, steps, fmt):
+        """Response with one processed image, or 503 without queueing when full."""
+        admit()
+        start = time.perf_counter()
+        try:
+            encoded, pixels = await run_job(data, steps, fmt)
+        except (UnidentifiedImageError, OSError) as e:
+            raise HTTPException(422, f"cannot decode image: {e}")
+        except (ValueError, TypeError) as e:
+            raise HTTPException(422, f"cannot process image: {e}")
+        return Response(encoded, media_type=EXPORT_FORMATS[fmt][1], headers={
+            "X-Pixels": str(pixels),
+            "X-Processing-Seconds": f"{time.perf_counter() - start:.4f}",
+        })
+
+    async def health(request):
+        return JSONResponse({
+            "workers": workers,
+            "capacity": capacity,
+            "in_flight": state["in_flight"],
+            "rejected": state["rejected"],
+        })
+
+    async def list_filters(request):
+        return JSONResponse({
+            name: {key: default for key, (arg, default) in spec.params.items()}
+            for name, spec in FILTERS.items()
+        })
+
+    async def apply_one(request):
+        step = _query_step(request.path_params["name"], request.query_params)
+        fmt = _output_format(request.query_params.get("format"))
+        images, _ = await _read_request(request)
+        return await run_single(images[0][1], [step], fmt)
+
+    async def process(request):
+        images, fields = await _read_request(request)
+        steps = _recipe(fields.get("recipe") or request.query_params.get("recipe"))
+        fmt = _output_format(fields.get("format") or request.query_params.get("format"))
+        return await run_single(images[0][1], steps, fmt)
+
+    async def batch(request):
+        images, fields = await _read_request(request)
+        steps = _recipe(fields.get("recipe") or request.query_params.get("recipe"))
+        fmt = _output_format(fields.get("format") or request.query_params.get("format"))
+        admit()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_job(data, steps, fmt) for _, data in images), return_exceptions=True)
+
+        buf, errors, pixels = io.BytesIO(), {}, 0
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as archive:
+            for index, ((name, _), result) in enumerate(zip(images, results)):
+                stem = os.path.splitext(os.path.basename(name))[0]
+                if isinstance(result, Exception):
+                    errors[name] = str(result)
+                    continue
+                archive.writestr(f"{index:04d}_{stem}.{EXPORT_FORMATS[fmt][0]}", result[0])
+                pixels += result[1]
+            if errors:
+                archive.writestr("errors.json", json.dumps(errors, indent=1))
+        return Response(buf.getvalue(), media_type="application/zip", headers={
+            "X-Images": str(len(images) - len(errors)),
+            "X-Failed": str(len(errors)),
+            "X-Pixels": str(pixels),
+            "X-Processing-Seconds": f"{time.perf_counter() - start:.4f}",
+        })
+
+    return Starlette(lifespan=lifespan, routes=[
+        Route("/health", health),
+        Route("/filters", list_filters),
+        Route("/filters/{name}", apply_one, methods=["POST"]),
+        Route("/process", process, methods=["POST"]),
+        Route("/batch", batch, methods=["POST"]),
+    ])
+
+
+app = create_app()
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m dip_studio.service", description="Serve the filters over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: DIP_SERVICE_WORKERS or CPU count)")
+    parser.add_argument("--queue-depth", type=int, default=None, help="jobs admitted beyond the busy workers before 503")
+    args = parser.parse_args(argv)
+    uvicorn.run(create_app(args.workers, args.queue_depth), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
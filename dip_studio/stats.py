@@ -0,0 +1,140 @@
+"""Per-image statistics index and the histogram-driven filters built on it."""
+
+import numpy as np
+
+from .cache import array_memo
+from .filters import _row_blocks, numpy_grayscale, numpy_threshold
+
+
+# =============================================================================
+# STATISTICS INDEX
+# =============================================================================
+# One block-wise pass over a uint8 image gives per-channel histograms, the
+# luminance plane and its histogram. Min, max and mean of every channel, and
+# the auto-level and Otsu thresholds, then come from the histograms in
+# O(256) rather than another pass over the pixels. The index of a cached
+# (read-only) image is memoized with cache.array_memo, and its luminance
+# plane is the one numpy_grayscale shares with the edge and threshold
+# filters, so switching between them on one upload converts it once.
+
+
+def _summary(histograms):
+    """(min, max, mean) arrays of a (channels, 256) histogram stack."""
+    values = np.arange(256)
+    occupied = histograms > 0
+    low = np.argmax(occupied, axis=1)
+    high = 255 - np.argmax(occupied[:, ::-1], axis=1)
+    mean = histograms @ values / np.maximum(histograms.sum(axis=1), 1)
+    return low.astype(np.uint8), high.astype(np.uint8), mean
+
+
+def compute_stats(image):
+    """Statistics index of a uint8 image, from one pass a block of rows at a time.
+
+    Returns a dict with 'histograms' (channels x 256), 'luminance' (H x W),
+    'luminance_histogram' (256) and per-channel 'min', 'max' and 'mean'.
+    Peak memory: 1 byte per pixel (the luminance plane, unless already
+    memoized) + POINT_BLOCK_BYTES.
+    """
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    histograms = np.zeros((channels, 256), dtype=np.int64)
+    luminance_histogram = np.zeros(256, dtype=np.int64)
+    luminance = numpy_grayscale(image)
+    for rows in _row_blocks(image):
+        block = image[rows]
+        if image.ndim == 2:
+            histograms[0] += np.bincount(block.ravel(), minlength=256)
+            continue
+        for channel in range(channels):
+            histograms[channel] += np.bincount(block[..., channel].ravel(), minlength=256)
+        luminance_histogram += np.bincount(luminance[rows].ravel(), minlength=256)
+    if image.ndim == 2:
+        luminance_histogram = histograms[0]
+
+    low, high, mean = _summary(histograms)
+    return {
+        "histograms": histograms,
+        "luminance": luminance,
+        "luminance_histogram": luminance_histogram,
+        "min": low,
+        "max": high,
+        "mean": mean,
+    }
+
+
+def image_stats(image):
+    """Statistics index of image, computed once per read-only array."""
+    return array_memo(image, "stats", _frozen_stats)
+
+
+def _frozen_stats(image):
+    stats = compute_stats(image)
+    if not image.flags.writeable:
+        for value in stats.values():
+            value.setflags(write=False)
+    return stats
+
+
+def otsu_threshold(histogram):
+    """Otsu's threshold of a 256-bin histogram: the level maximizing between-class variance.
+
+    Pixels above the returned level form the foreground, as in numpy_threshold.
+    """
+    counts = histogram.astype(np.float64)
+    below = np.cumsum(counts)
+    below_sum = np.cumsum(counts * np.arange(256))
+    total, total_sum = below[-1], below_sum[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (total_sum * below - below_sum * total) ** 2 / (below * (total - below))
+    return int(np.argmax(np.nan_to_num(between, nan=0.0, posinf=0.0)))
+
+
+def auto_level_tables(histograms, clip_percent=0.0):
+    """Per-channel uint8 tables stretching each channel's range to 0..255.
+
+    clip_percent of the samples at each end are saturated, so a few outliers
+    do not pin the range.
+    """
+    values = np.arange(256, dtype=np.float64)
+    tables = np.empty(histograms.shape, dtype=np.uint8)
+    for channel, histogram in enumerate(histograms):
+        cumulative = np.cumsum(histogram)
+        clip = cumulative[-1] * clip_percent / 100
+        low = int(np.searchsorted(cumulative, clip, side="right"))
+        high = int(np.searchsorted(cumulative, cumulative[-1] - clip, side="left"))
+        if high <= low:
+            tables[channel] = values
+            continue
+        tables[channel] = np.clip(np.round((values - low) * 255 / (high - low)), 0, 255)
+    return tables
+
+
+# =============================================================================
+# HISTOGRAM-DRIVEN FILTERS
+# =============================================================================
+# Their output depends on statistics of the whole image, so the registry runs
+# them in one piece rather than in tiles or bands.
+
+
+def numpy_auto_levels(image, clip_percent=0.5):
+    """Auto levels: stretch every channel to the full 0..255 range.
+
+    Levels come from the statistics index in O(256); applying them is one
+    table lookup per sample. Peak memory: 1 byte per sample, plus the index.
+    """
+    tables = auto_level_tables(image_stats(image)["histograms"], clip_percent)
+    if image.ndim == 2:
+        return np.take(tables[0], image)
+    out = np.empty_like(image)
+    for channel in range(image.shape[2]):
+        out[..., channel] = np.take(tables[channel], image[..., channel])
+    return out
+
+
+def numpy_auto_threshold(image):
+    """Binary threshold at Otsu's level of the luminance histogram.
+
+    Reuses the index's luminance plane. Peak memory: as numpy_threshold, plus the index.
+    """
+    stats = image_stats(image)
+    return numpy_threshold(stats["luminance"], otsu_threshold(stats["luminance_histogram"]))
@@ -0,0 +1,30 @@
+"""Batch CLI output naming."""
+
+import io
+import os
+
+import numpy as np
+from PIL import Image
+
+from dip_studio.batch import find_images, output_paths, run_batch
+
+
+def test_colliding_stems_are_numbered():
+    paths = ["c1/x.jpg", "c1/x.png", "c1/x-2.png", "c2/X.png", "c2/y.png"]
+    names = [os.path.basename(out) for out in output_paths(paths, "out", "png").values()]
+    assert names == ["x.png", "x-2.png", "x-2-2.png", "X-3.png", "y.png"]
+
+
+def test_batch_keeps_every_image(tmp_path):
+    for folder, name in [("c1", "x.png"), ("c2", "x.png"), ("c1", "x.jpg")]:
+        os.makedirs(tmp_path / folder, exist_ok=True)
+        Image.new("RGB", (8, 8), (10, 20, 30)).save(tmp_path / folder / name)
+    paths = find_images([str(tmp_path / "c1"), str(tmp_path / "c2")])
+    log = io.StringIO()
+    done, failed, _, _ = run_batch(paths, str(tmp_path / "out"), [("Invert", {})], workers=1, log=log)
+    assert (done, failed) == (3, 0)
+    outputs = sorted(os.listdir(tmp_path / "out"))
+    assert outputs == ["x-2.png", "x-3.png", "x.png"]
+    for name in outputs:
+        assert np.array_equal(np.asarray(Image.open(tmp_path / "out" / name)), np.full((8, 8, 3), (245, 235, 225)))
+    assert log.getvalue().count("name taken") == 2
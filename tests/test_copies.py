@@ -0,0 +1,13 @@
+"""Full-image copies made while ingesting an upload, as measured by benchmarks.copies."""
+
+import pytest
+
+from benchmarks.copies import INGEST_BUDGET, RERUN_BUDGET, request_copies, sample_uploads, within_budget
+
+
+@pytest.mark.parametrize("width, height", [(64, 48), (640, 480), (2000, 1500)])
+def test_ingest_and_cached_rerun_stay_within_budget(width, height):
+    for label, data in sample_uploads(width, height).items():
+        legacy, ingest, rerun, image = request_copies(data)
+        assert within_budget(ingest, INGEST_BUDGET, image), f"{label}: ingest made {ingest:.2f} copies"
+        assert within_budget(rerun, RERUN_BUDGET, image), f"{label}: cached rerun made {rerun:.2f} copies"
@@ -0,0 +1,53 @@
+"""OpenCV drop-ins against their NumPy references, as checked by benchmarks.engines."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from benchmarks.engines import CASES, TOLERANCE, border_mode_rows, engine_wiring_rows, parity_rows, sample_images
+from dip_studio import registry
+from dip_studio.filters import PRECISION
+from dip_studio.opencv_filters import OPENCV_FILTERS
+from dip_studio.pipeline import apply_pipeline
+from dip_studio.preview import scale_params
+from dip_studio.registry import FILTERS, filter_kwargs, filter_spec
+
+IMAGES = sample_images(67, 101)
+
+
+@pytest.mark.parametrize("name, params", CASES, ids=[f"{name} {params}" for name, params in CASES])
+def test_parity_with_reference(name, params):
+    for _, _, label, worst, differ, border, allowed in parity_rows(IMAGES, [(name, params)]):
+        assert worst <= allowed, f"{label}: {differ} pixels differ, by up to {worst}"
+
+
+@pytest.mark.parametrize("scale", [1 / 2, 1 / 4, 1 / 8])
+@pytest.mark.parametrize("name", sorted(OPENCV_FILTERS))
+def test_preview_scaled_defaults_match_reference(name, scale):
+    # Preview levels shrink kernels, down to kernel_size 1 at 1/4 and 1/8
+    kwargs = filter_kwargs(name, scale_params(name, {}, scale))
+    for label, image in IMAGES.items():
+        result = filter_spec(name, "opencv").function(image, **kwargs)
+        reference = FILTERS[name].function(image, **kwargs)
+        assert result.shape == reference.shape and result.dtype == reference.dtype, label
+        assert np.abs(result.astype(np.int16) - reference).max() <= TOLERANCE.get(name, 0), label
+
+
+def test_only_reflect_101_matches_the_reference_border():
+    rows = {label: worst for label, differ, worst in border_mode_rows(IMAGES["smooth"])}
+    assert rows["REFLECT_101"] <= TOLERANCE["Gaussian Blur"]
+    assert rows["REFLECT"] > rows["REFLECT_101"] and rows["REPLICATE"] > rows["REFLECT_101"]
+
+
+def test_tiles_and_bands_match_one_call():
+    for name, params, tiled, banded in engine_wiring_rows(sample_images(203, 301)["smooth"]):
+        allowed = 0 if PRECISION == "float64" else TOLERANCE.get(name, 0)
+        assert max(tiled, banded) <= allowed, (name, params)
+
+
+def test_pipeline_runs_every_filter_under_the_opencv_engine(monkeypatch):
+    monkeypatch.setattr(registry, "ENGINE", "opencv")
+    image = IMAGES["noise"]
+    for name in FILTERS:
+        assert apply_pipeline(image, [(name, {})]).shape[:2] == image.shape[:2], name
@@ -0,0 +1,34 @@
+"""Decoding uploads of every grayscale depth to uint8."""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dip_studio.image_io import decode_image
+
+RAMP = np.arange(0, 65536, 257, dtype=np.uint16).reshape(16, 16)  # 0..65535, one step per 8-bit level
+
+
+def _encode(pil_image, fmt):
+    buf = io.BytesIO()
+    pil_image.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("pil_image, fmt", [
+    (Image.fromarray(RAMP), "PNG"),
+    (Image.fromarray(RAMP.astype(np.int32)), "TIFF"),
+    (Image.fromarray(RAMP.astype(np.float32) / 65535), "TIFF"),
+    (Image.fromarray(RAMP.astype(np.float32) * 3 - 1000), "TIFF"),
+], ids=["I;16", "I", "F 0..1", "F any range"])
+def test_deep_grayscale_scales_onto_8_bits(pil_image, fmt):
+    image = decode_image(_encode(pil_image, fmt))
+    assert image.dtype == np.uint8 and image.shape == RAMP.shape
+    np.testing.assert_array_equal(image.ravel(), np.arange(256))
+
+
+def test_16_bit_grayscale_keeps_its_brightness():
+    dark = Image.fromarray(RAMP // 16)  # 12-bit data in a 16-bit file stays dark
+    assert decode_image(_encode(dark, "PNG")).max() == 16
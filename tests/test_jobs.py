@@ -0,0 +1,33 @@
+"""Session jobs keep only result keys once a job finishes."""
+
+import threading
+
+import numpy as np
+
+from dip_studio.jobs import SessionJobs, check_cancelled
+
+
+def test_finished_jobs_keep_only_their_key():
+    jobs = SessionJobs(workers=1)
+    result = np.zeros((64, 64, 3), dtype=np.uint8)
+    future = jobs.submit("a", ("result", "digest", 1), lambda: result)
+    assert future.result() is result
+    assert jobs.last_completed("a") == ("result", "digest", 1)
+    assert "a" not in jobs._jobs  # the finished future and its pixels are not held
+    assert jobs.last_completed("b") is None
+
+
+def test_cancel_stops_the_live_job():
+    jobs = SessionJobs(workers=1)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        while True:
+            check_cancelled()
+
+    future = jobs.submit("a", "slow", slow)
+    started.wait(5)
+    jobs.cancel("a")
+    assert future.exception(5) is not None and jobs.cancelled == 1
+    assert jobs.last_completed("a") is None
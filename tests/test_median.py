@@ -0,0 +1,39 @@
+"""The two NumPy median engines against each other and np.median."""
+
+import numpy as np
+import pytest
+
+from dip_studio import filters
+from dip_studio.filters import _median_histogram, _median_partition, numpy_median_filter
+
+RNG = np.random.default_rng(0)
+IMAGES = {
+    "gray": RNG.integers(0, 256, (37, 53), dtype=np.uint8),
+    "rgb": RNG.integers(0, 256, (41, 29, 3), dtype=np.uint8),
+    "flat": np.full((20, 24, 3), 77, dtype=np.uint8),
+}
+
+
+@pytest.mark.parametrize("kernel_size", [1, 3, 5, 9, 15, 31])
+@pytest.mark.parametrize("label", sorted(IMAGES))
+def test_engines_agree(label, kernel_size):
+    image = IMAGES[label]
+    assert np.array_equal(_median_histogram(image, kernel_size), _median_partition(image, kernel_size))
+
+
+def test_histogram_matches_np_median():
+    image, kernel_size = IMAGES["rgb"], 5
+    pad = kernel_size // 2
+    padded = np.pad(image, ((pad, pad), (pad, pad), (0, 0)), mode="reflect")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (kernel_size, kernel_size), axis=(0, 1))
+    assert np.array_equal(_median_histogram(image, kernel_size), np.median(windows, axis=(-2, -1)).astype(np.uint8))
+
+
+def test_engine_chosen_by_kernel_size(monkeypatch):
+    calls = []
+    monkeypatch.setattr(filters, "_median_histogram", lambda image, k: calls.append(("histogram", k)))
+    monkeypatch.setattr(filters, "_median_partition", lambda image, k: calls.append(("partition", k)))
+    image = IMAGES["gray"]
+    numpy_median_filter(image, filters.MEDIAN_HISTOGRAM_MIN_KERNEL - 2)
+    numpy_median_filter(image, 14)  # even sizes round up
+    assert calls == [("partition", filters.MEDIAN_HISTOGRAM_MIN_KERNEL - 2), ("histogram", 15)]
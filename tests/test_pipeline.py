@@ -0,0 +1,39 @@
+"""Large images take the worker pool, tile by tile, and still match one whole-image call."""
+
+import numpy as np
+import pytest
+
+from dip_studio import parallel, pipeline
+from dip_studio.registry import FILTERS, filter_kwargs, is_global_filter
+
+IMAGE = np.random.default_rng(0).integers(0, 256, (301, 413, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def tiny_thresholds(monkeypatch):
+    """Scale the size thresholds down so IMAGE counts as a very large image."""
+    monkeypatch.setattr(parallel, "PARALLEL_WORKERS", 3)
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_PIXELS", 1000)
+    monkeypatch.setattr(pipeline, "TILED_MIN_PIXELS", 10000)
+    monkeypatch.setattr(pipeline, "TILE_SIZE", 128)
+
+
+def test_very_large_images_use_the_worker_pool(tiny_thresholds, monkeypatch):
+    calls = []
+    run = parallel.numpy_parallel_filter
+
+    def recorded(*args, **kwargs):
+        calls.append(kwargs)
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(parallel, "numpy_parallel_filter", recorded)
+    pipeline.apply_filter("Box Blur", IMAGE, {"kernel_size": 5})
+    assert calls == [{"tile_size": 128}]
+
+
+@pytest.mark.parametrize("name", [name for name in FILTERS if not is_global_filter(name)])
+def test_tiles_across_workers_match_one_call(tiny_thresholds, name):
+    params = {"kernel_size": 7} if "kernel_size" in FILTERS[name].params else {}
+    image = pipeline.numpy_grayscale(IMAGE) if name in pipeline.LUMINANCE_FILTERS else IMAGE
+    expected = FILTERS[name].function(image, **filter_kwargs(name, params))
+    np.testing.assert_array_equal(pipeline.apply_filter(name, IMAGE, params), expected)
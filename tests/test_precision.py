@@ -0,0 +1,33 @@
+"""Every filter in every precision mode against the float64 reference, as checked by benchmarks.precision."""
+
+import numpy as np
+import pytest
+
+from benchmarks.precision import TOLERANCE, sample_images
+from dip_studio import filters
+from dip_studio.filters import PRECISION_MODES
+from dip_studio.registry import FILTERS, filter_kwargs
+
+IMAGES = sample_images(67, 101)
+IMAGES.update({f"{label} gray": image[..., 0].copy() for label, image in list(IMAGES.items())})
+# Registry defaults, plus the large kernels and strengths the benchmark times
+CASES = [(name, {}) for name in FILTERS] + [
+    ("Gaussian Blur", {"kernel_size": 15, "sigma": 3.0}),
+    ("Box Blur", {"kernel_size": 15}),
+    ("Sharpen", {"strength": 2.5}),
+]
+
+
+def run(monkeypatch, name, params, image, precision):
+    monkeypatch.setattr(filters, "PRECISION", precision)
+    return FILTERS[name].function(image, **filter_kwargs(name, params))
+
+
+@pytest.mark.parametrize("label", sorted(IMAGES))
+@pytest.mark.parametrize("precision", [mode for mode in PRECISION_MODES if mode != "float64"])
+@pytest.mark.parametrize("name, params", CASES, ids=[f"{name} {params}" for name, params in CASES])
+def test_within_one_grey_level_of_float64(monkeypatch, name, params, precision, label):
+    reference = run(monkeypatch, name, params, IMAGES[label], "float64")
+    result = run(monkeypatch, name, params, IMAGES[label], precision)
+    assert result.shape == reference.shape and result.dtype == reference.dtype
+    assert np.abs(result.astype(np.int16) - reference).max() <= TOLERANCE
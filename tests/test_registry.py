@@ -0,0 +1,21 @@
+"""Parameter validation shared by the batch CLI and the service."""
+
+import pytest
+
+from dip_studio.registry import MAX_KERNEL_SIZE, MAX_SIGMA, check_params
+
+
+@pytest.mark.parametrize("params", [
+    {}, {"kernel_size": 1}, {"kernel_size": MAX_KERNEL_SIZE, "sigma": MAX_SIGMA}, {"sigma": 0.1},
+])
+def test_accepts_values_in_range(params):
+    check_params("Gaussian Blur", params)
+
+
+@pytest.mark.parametrize("params", [
+    {"kernel_size": MAX_KERNEL_SIZE + 2}, {"kernel_size": 3001}, {"kernel_size": 4}, {"kernel_size": -1},
+    {"kernel_size": 5.0}, {"sigma": 0}, {"sigma": MAX_SIGMA * 2}, {"sigma": float("inf")}, {"radius": 3},
+])
+def test_rejects_values_out_of_range(params):
+    with pytest.raises(ValueError):
+        check_params("Gaussian Blur", params)